@@ -19,32 +19,26 @@ from agentsync_mcp.services.work_queue import WorkQueue
 DB_PATH = Path(__file__).parent.parent / "data" / "agentsync.db"
 
 
-async def simulate_agent(name: str, files: list[str], description: str, db: Database):
+async def simulate_agent(
+    name: str, files: list[str], description: str, lm: LockManager, wq: WorkQueue
+):
     """Simulate one agent's workflow."""
-    lm = LockManager(db, cleanup_interval=3600)
-    wq = WorkQueue(db)
-    await lm.start()
-
     print(f"\n[{name}] Trying to lock: {files}")
     print(f"[{name}] Reason: {description}")
 
-    locked = []
-    blocked = []
-    for f in files:
-        result = await lm.acquire_lock(f, name, description, ttl_seconds=300)
-        if result["success"]:
-            locked.append(f)
-        else:
-            blocked.append(result)
+    results = await lm.acquire_locks(files, name, description, ttl_seconds=300)
+    locked = [f for f, result in results.items() if result["success"]]
+    blocked = [result for result in results.values() if not result["success"]]
 
     if locked:
         print(f"[{name}] ✅ Locked: {locked}")
         await wq.create_work_item(name, description, locked)
     if blocked:
         for b in blocked:
-            print(f"[{name}] ❌ BLOCKED — '{b.get('locked_by')}' is working on: {b.get('description')}")
+            print(
+                f"[{name}] ❌ BLOCKED — '{b.get('locked_by')}' is working on: {b.get('description')}"
+            )
 
-    await lm.stop()
     return locked, blocked
 
 
@@ -53,6 +47,10 @@ async def main():
     db = Database(DB_PATH)
     await db.initialize()
 
+    lm = LockManager(db, cleanup_interval=3600)
+    wq = WorkQueue(db)
+    await lm.start()
+
     print("=" * 60)
     print("AgentSync Multi-Agent Demo")
     print("=" * 60)
@@ -62,7 +60,8 @@ async def main():
         "claude-alice",
         ["src/auth.py", "src/login.py"],
         "Fixing authentication bug in login flow",
-        db,
+        lm,
+        wq,
     )
 
     # --- Agent Bob tries the SAME files ---
@@ -70,14 +69,11 @@ async def main():
         "claude-bob",
         ["src/auth.py", "src/api/users.py"],
         "Adding OAuth2 support",
-        db,
+        lm,
+        wq,
     )
 
     # --- Bob checks what's happening ---
-    lm = LockManager(db, cleanup_interval=3600)
-    await lm.start()
-    wq = WorkQueue(db)
-
     print(f"\n[claude-bob] Checking all active work...")
     active = await wq.get_active_work()
     for item in active:
@@ -95,7 +91,8 @@ async def main():
         "claude-bob",
         ["src/auth.py", "src/api/users.py"],
         "Adding OAuth2 support",
-        db,
+        lm,
+        wq,
     )
 
     await lm.stop()
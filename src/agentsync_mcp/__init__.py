@@ -1,3 +1,5 @@
 """AgentSync MCP - Multi-Agent Code Coordination Platform."""
 
-__version__ = "0.1.0"
+from agentsync_mcp._version import __version__
+
+__all__ = ["__version__"]
@@ -1,10 +1,27 @@
 from __future__ import annotations
 
 import asyncio
+import sys
+from collections.abc import Coroutine
+from typing import Any, TypeVar
 
 import click
 
-from agentsync_mcp import __version__
+from agentsync_mcp._version import __version__
+
+T = TypeVar("T")
+
+
+def _run_async(coro: Coroutine[Any, Any, T]) -> T:
+    """Run ``coro`` on uvloop when it is installed, else on the default loop."""
+    if sys.platform != "win32":
+        try:
+            import uvloop
+        except ImportError:
+            pass
+        else:
+            return uvloop.run(coro)
+    return asyncio.run(coro)
 
 
 @click.group()
@@ -30,7 +47,7 @@ def init(db_path: str) -> None:
         await db.close()
         click.echo(f"Database initialized at {db_path}")
 
-    asyncio.run(_init())
+    _run_async(_init())
 
 
 @main.command()
@@ -77,7 +94,7 @@ def _run_auto_wrapper(
         )
         return await runner.run()
 
-    code = asyncio.run(_run())
+    code = _run_async(_run())
     raise SystemExit(code)
 
 
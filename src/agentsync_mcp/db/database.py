@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import random
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from contextlib import asynccontextmanager
 from datetime import datetime
 from importlib import resources
 from pathlib import Path
@@ -10,22 +14,141 @@ from typing import Any
 import aiosqlite
 
 from agentsync_mcp.models.lock import LockInfo
+from agentsync_mcp.utils import jsonio
 
 logger = logging.getLogger(__name__)
 
 _DEFAULT_DB_PATH = Path("data/agentsync.db")
 
+_SCHEMA_SQL = resources.files("agentsync_mcp.db").joinpath("schema.sql").read_text()
+
+# Stored in ``PRAGMA user_version`` once schema.sql and _migrate_schema have
+# been applied. Bump it whenever either of them changes.
+# 2: re-run the file join table backfill for rows written by pre-join-table
+#    server processes after version 1 was recorded.
+SCHEMA_VERSION = 2
+
+# Maximum number of queued writes committed together in one transaction.
+_WRITE_BATCH_SIZE = 32
+
+# Read-only connections used for SELECTs so reads do not queue behind the
+# writer connection (WAL allows readers alongside one writer).
+_READER_POOL_SIZE = 3
+
+# ``touch_agent`` and ``log_event_nowait`` calls are buffered and written
+# together at most this often; ``last_active`` and the telemetry event log
+# only need to be fresh to within a second or so.
+_BUFFER_FLUSH_SECONDS = 1.0
+
+# Retry policy for SQLITE_BUSY / "database is locked" on a write batch:
+# exponential backoff with full jitter, delays in milliseconds.
+_WRITE_RETRY_ATTEMPTS = 8
+_WRITE_RETRY_BASE_MS = 1.0
+_WRITE_RETRY_CAP_MS = 100.0
+
+# Default page size for the recent-actions queries.
+_RECENT_ACTIONS_LIMIT = 100
+
+# sqlite3 keeps compiled statements in a per-connection LRU keyed by SQL
+# text. Hot statements live in module constants so every call site
+# shares one cache entry, and the cache is sized to hold all of them.
+_STATEMENT_CACHE_SIZE = 256
+
+_AGENT_COLUMNS = """
+    agent_id,
+    agent_type,
+    client_name,
+    session_label,
+    user_id,
+    host,
+    pid,
+    cwd,
+    repo_root,
+    repo_name,
+    git_branch,
+    transport,
+    metadata,
+    first_seen,
+    last_active,
+    status
+"""
+
+# Current local time in the same ISO-8601 layout ``datetime.isoformat()``
+# uses for lock timestamps, so expiry checks can compare inside SQLite and
+# release/completion stamps match the Python-written columns.
+_SQL_NOW_ISO = "strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime')"
+
+_INSERT_LOCK_SQL = """
+    INSERT INTO file_locks (file_path, agent_id, description, locked_at, expires_at, status)
+    VALUES (?, ?, ?, ?, ?, 'active')
+"""
+
+_LOG_EVENT_SQL = """
+    INSERT INTO event_log (event_type, agent_id, details)
+    VALUES (?, ?, ?)
+"""
+
+_RELEASE_LOCK_SQL = f"""
+    UPDATE file_locks
+    SET status = 'released', released_at = {_SQL_NOW_ISO}
+    WHERE file_path = ? AND agent_id = ? AND status = 'active'
+"""
+
+_RENEW_LOCK_SQL = """
+    UPDATE file_locks SET expires_at = ?
+    WHERE file_path = ? AND status = 'active'
+"""
+
+_TOUCH_AGENT_SQL = """
+    UPDATE agents
+    SET last_active = CURRENT_TIMESTAMP, status = 'active'
+    WHERE agent_id = ?
+"""
+
+_INSERT_WORK_ITEM_SQL = """
+    INSERT INTO work_items (agent_id, description, files, status)
+    VALUES (?, ?, ?, 'in_progress')
+"""
+
+_INSERT_WORK_ITEM_FILE_SQL = """
+    INSERT INTO work_item_files (work_item_id, position, file_path)
+    VALUES (?, ?, ?)
+"""
+
+_INSERT_ACTION_SQL = """
+    INSERT INTO agent_actions (agent_id, action_type, files, intent)
+    VALUES (?, ?, ?, ?)
+"""
+
+_INSERT_ACTION_FILE_SQL = """
+    INSERT INTO action_files (action_id, position, file_path)
+    VALUES (?, ?, ?)
+"""
+
+WriteOp = Callable[[aiosqlite.Connection], Awaitable[Any]]
+
 
 class Database:
     """Async SQLite database layer for AgentSync persistence.
 
-    Holds a single persistent connection with WAL mode for concurrent reads.
-    All writes are serialised through that connection.
+    Holds one persistent writer connection with WAL mode. All writes are
+    queued to a background writer task that commits up to
+    ``_WRITE_BATCH_SIZE`` pending writes per transaction, so a burst of
+    concurrent tool calls costs one commit instead of one per call.
+    Reads are served by a small pool of ``query_only`` connections and so
+    never wait behind the writer.
     """
 
     def __init__(self, db_path: str | Path | None = None):
         self.db_path = Path(db_path) if db_path else _DEFAULT_DB_PATH
         self._conn: aiosqlite.Connection | None = None
+        self._write_queue: asyncio.Queue[tuple[WriteOp, asyncio.Future[Any]]] | None = None
+        self._writer_task: asyncio.Task[None] | None = None
+        self._pending_touches: set[str] = set()
+        self._pending_events: list[tuple[str, str | None, str | None]] = []
+        self._buffer_timer: asyncio.TimerHandle | None = None
+        self._readers: list[aiosqlite.Connection] = []
+        self._idle_readers: asyncio.Queue[aiosqlite.Connection] | None = None
 
     # ------------------------------------------------------------------
     # Lifecycle
@@ -33,24 +156,54 @@ class Database:
 
     async def initialize(self) -> None:
         """Create the database file, apply the schema, and open the persistent connection."""
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.is_memory:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
-        schema_sql = (
-            resources.files("agentsync_mcp.db").joinpath("schema.sql").read_text()
+        # Open the persistent connection. Transactions are managed explicitly
+        # by the writer task, so the connection runs in autocommit mode.
+        self._conn = await aiosqlite.connect(
+            self.db_path,
+            isolation_level=None,
+            cached_statements=_STATEMENT_CACHE_SIZE,
         )
-
-        # Open the persistent connection
-        self._conn = await aiosqlite.connect(self.db_path)
         self._conn.row_factory = aiosqlite.Row
-        await self._conn.execute("PRAGMA journal_mode=WAL")
-        await self._conn.execute("PRAGMA foreign_keys=ON")
-        await self._conn.executescript(schema_sql)
-        await self._migrate_schema()
-        await self._conn.commit()
+        await self._apply_pragmas()
+        await self._ensure_schema()
+
+        self._write_queue = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._writer_loop())
+        await self._open_readers()
 
         logger.info("Database initialized at %s", self.db_path)
 
+    async def flush(self) -> None:
+        """Wait until every queued and buffered write has been committed."""
+        if self._write_queue is not None and self._writer_task is not None:
+            self._flush_buffered_writes()
+            await self._write_queue.join()
+
+    async def optimize(self) -> None:
+        """Refresh planner statistics if SQLite thinks they are stale (cheap otherwise)."""
+        await self._enqueue_write("PRAGMA optimize")
+
     async def close(self) -> None:
+        if self._writer_task:
+            try:
+                await self.optimize()
+            except aiosqlite.Error as exc:
+                logger.warning("PRAGMA optimize failed on close: %s", exc)
+            await self.flush()
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+            self._write_queue = None
+        for reader in self._readers:
+            await reader.close()
+        self._readers = []
+        self._idle_readers = None
         if self._conn:
             await self._conn.close()
             self._conn = None
@@ -60,6 +213,113 @@ class Database:
         assert self._conn is not None, "Database not initialized — call initialize() first"
         return self._conn
 
+    @property
+    def is_memory(self) -> bool:
+        return str(self.db_path) == ":memory:"
+
+    async def _apply_pragmas(self) -> None:
+        """Tune the connection for many short write transactions.
+
+        ``busy_timeout`` lets concurrent server processes wait inside SQLite
+        instead of failing with SQLITE_BUSY.  ``synchronous=NORMAL`` is only
+        durable under WAL, so it is applied only once WAL is confirmed.
+        In-memory databases have no journal or pages on disk to tune.
+        """
+        await self.conn.execute("PRAGMA foreign_keys=ON")
+        await self.conn.execute("PRAGMA busy_timeout=5000")
+        if self.is_memory:
+            return
+
+        cursor = await self.conn.execute("PRAGMA journal_mode=WAL")
+        row = await cursor.fetchone()
+        if row and str(row[0]).lower() == "wal":
+            await self.conn.execute("PRAGMA synchronous=NORMAL")
+            await self.conn.execute("PRAGMA wal_autocheckpoint=1000")
+        await self.conn.execute("PRAGMA temp_store=MEMORY")
+        await self.conn.execute("PRAGMA cache_size=-64000")
+        await self.conn.execute("PRAGMA mmap_size=268435456")
+
+    async def _open_readers(self) -> None:
+        # Separate connections to ":memory:" would each get their own empty
+        # database, so in-memory databases read through the writer connection.
+        if self.is_memory:
+            return
+        self._idle_readers = asyncio.Queue()
+        for _ in range(_READER_POOL_SIZE):
+            reader = await aiosqlite.connect(
+                self.db_path,
+                isolation_level=None,
+                cached_statements=_STATEMENT_CACHE_SIZE,
+            )
+            reader.row_factory = aiosqlite.Row
+            await reader.execute("PRAGMA query_only=ON")
+            await reader.execute("PRAGMA busy_timeout=5000")
+            await reader.execute("PRAGMA cache_size=-16000")
+            await reader.execute("PRAGMA mmap_size=268435456")
+            self._readers.append(reader)
+            self._idle_readers.put_nowait(reader)
+
+    @asynccontextmanager
+    async def _acquire_reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow an idle read-only connection, waiting if all are busy."""
+        if self._idle_readers is None:
+            yield self.conn
+            return
+        reader = await self._idle_readers.get()
+        try:
+            yield reader
+        finally:
+            self._idle_readers.put_nowait(reader)
+
+    async def _fetchall(self, sql: str, params: Sequence[Any] = ()) -> list[aiosqlite.Row]:
+        async with self._acquire_reader() as conn:
+            cursor = await conn.execute(sql, params)
+            return list(await cursor.fetchall())
+
+    async def _fetchone(self, sql: str, params: Sequence[Any] = ()) -> aiosqlite.Row | None:
+        async with self._acquire_reader() as conn:
+            cursor = await conn.execute(sql, params)
+            return await cursor.fetchone()
+
+    async def _ensure_schema(self) -> None:
+        """Apply schema.sql and migrations unless ``user_version`` says they are current.
+
+        Runs in one ``BEGIN IMMEDIATE`` transaction so server processes
+        starting together take turns instead of racing the same
+        ``ALTER TABLE``; the version is re-read once the write lock is held.
+        A current schema costs one ``PRAGMA user_version`` read; a schema
+        newer than this code is left untouched.
+        """
+        version = await self._schema_version()
+        if version > SCHEMA_VERSION:
+            logger.warning(
+                "Database schema version %d is newer than supported version %d; "
+                "skipping migrations",
+                version,
+                SCHEMA_VERSION,
+            )
+            return
+        if version == SCHEMA_VERSION:
+            return
+
+        try:
+            # executescript commits any open transaction before it runs, so
+            # the BEGIN has to be part of the script itself.
+            await self.conn.executescript(f"BEGIN IMMEDIATE;\n{_SCHEMA_SQL}")
+            if await self._schema_version() < SCHEMA_VERSION:
+                await self._migrate_schema()
+                await self.conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            await self.conn.execute("COMMIT")
+        except BaseException:
+            if self.conn.in_transaction:
+                await self.conn.rollback()
+            raise
+
+    async def _schema_version(self) -> int:
+        cursor = await self.conn.execute("PRAGMA user_version")
+        row = await cursor.fetchone()
+        return row[0] if row else 0
+
     async def _migrate_schema(self) -> None:
         """Backfill newer columns on existing databases."""
         agent_columns = {
@@ -81,6 +341,59 @@ class Database:
             "CREATE INDEX IF NOT EXISTS idx_agents_status_last_active ON agents(status, last_active)"
         )
 
+        # Superseded by the partial idx_locks_active / idx_work_active indexes;
+        # left in place the planner would keep preferring them.
+        await self.conn.execute("DROP INDEX IF EXISTS idx_locks_status")
+        await self.conn.execute("DROP INDEX IF EXISTS idx_work_status")
+
+        await self._backfill_file_tables()
+
+    async def _backfill_file_tables(self) -> None:
+        """Populate the file join tables for rows that only have the JSON column.
+
+        Covers rows written before the tables existed, or by older server
+        processes that only fill the JSON columns. Runs as part of a schema
+        version bump, not on every start.
+        """
+        await self.conn.execute(
+            """
+            INSERT INTO work_item_files (work_item_id, position, file_path)
+            SELECT w.id, CAST(j.key AS INTEGER), j.value
+            FROM work_items w, json_each(w.files) j
+            WHERE json_valid(w.files)
+              AND NOT EXISTS (SELECT 1 FROM work_item_files f WHERE f.work_item_id = w.id)
+            """
+        )
+        await self.conn.execute(
+            """
+            INSERT INTO action_files (action_id, position, file_path)
+            SELECT a.id, CAST(j.key AS INTEGER), j.value
+            FROM agent_actions a, json_each(a.files) j
+            WHERE json_valid(a.files)
+              AND NOT EXISTS (SELECT 1 FROM action_files f WHERE f.action_id = a.id)
+            """
+        )
+
+    async def _files_by_parent(
+        self, table: str, parent_column: str, parent_ids: list[int]
+    ) -> dict[int, list[str]]:
+        """Load ordered file lists for several parent rows of a file join table."""
+        files: dict[int, list[str]] = {parent_id: [] for parent_id in parent_ids}
+        if not parent_ids:
+            return files
+        placeholders = ",".join("?" * len(parent_ids))
+        rows = await self._fetchall(
+            f"""
+            SELECT {parent_column}, file_path FROM {table}
+            WHERE {parent_column} IN ({placeholders})
+            ORDER BY {parent_column}, position
+            """,
+            parent_ids,
+        )
+        for parent_id, file_path in rows:
+            files[parent_id].append(file_path)
+        return files
+
     async def _ensure_column(self, table: str, column: str, ddl: str) -> None:
         cursor = await self.conn.execute(f"PRAGMA table_info({table})")
         rows = await cursor.fetchall()
@@ -89,6 +402,143 @@ class Database:
             return
         await self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
 
+    # ------------------------------------------------------------------
+    # Write queue
+    # ------------------------------------------------------------------
+
+    async def _submit_write(self, op: WriteOp) -> Any:
+        """Queue ``op`` for the writer task and wait for its committed result."""
+        assert self._write_queue is not None, "Database not initialized — call initialize() first"
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._write_queue.put_nowait((op, future))
+        return await future
+
+    def _arm_buffer_flush(self) -> None:
+        if self._buffer_timer is None:
+            self._buffer_timer = asyncio.get_running_loop().call_later(
+                _BUFFER_FLUSH_SECONDS, self._flush_buffered_writes
+            )
+
+    def _flush_buffered_writes(self) -> None:
+        """Queue one write for the touches and events buffered since the last flush."""
+        if self._buffer_timer is not None:
+            self._buffer_timer.cancel()
+            self._buffer_timer = None
+        if self._write_queue is None or not (self._pending_touches or self._pending_events):
+            return
+        touches = [(agent_id,) for agent_id in self._pending_touches]
+        events = self._pending_events
+        self._pending_touches = set()
+        self._pending_events = []
+
+        async def op(conn: aiosqlite.Connection) -> None:
+            if touches:
+                await conn.executemany(_TOUCH_AGENT_SQL, touches)
+            if events:
+                await conn.executemany(_LOG_EVENT_SQL, events)
+
+        # Nobody awaits this write, so failures are logged from a callback.
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_log_buffered_write_failure)
+        self._write_queue.put_nowait((op, future))
+
+    async def _enqueue_write(self, sql: str, params: Sequence[Any] = ()) -> aiosqlite.Cursor:
+        """Queue a single write statement; returns its cursor once committed."""
+
+        async def op(conn: aiosqlite.Connection) -> aiosqlite.Cursor:
+            return await conn.execute(sql, params)
+
+        return await self._submit_write(op)
+
+    async def _writer_loop(self) -> None:
+        """Drain the write queue, committing each batch in one transaction."""
+        assert self._write_queue is not None
+        queue = self._write_queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < _WRITE_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await self._run_write_batch(batch)
+            except Exception as exc:
+                # Keep the writer alive: a dead writer would hang every later write.
+                logger.exception("Write batch of %d failed unexpectedly", len(batch))
+                _fail_pending(batch, exc)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _run_write_batch(self, batch: list[tuple[WriteOp, asyncio.Future[Any]]]) -> None:
+        """Run a batch of writes in one transaction and resolve their futures.
+
+        If another process holds the write lock, the whole batch is rolled
+        back and retried with jittered exponential backoff. Any other error
+        that fails the transaction as a whole (e.g. at ``COMMIT``) reruns
+        the ops one per transaction, so only the ops at fault fail.
+        """
+        attempt = 0
+        while True:
+            try:
+                outcomes = await self._execute_write(batch)
+                break
+            except aiosqlite.Error as exc:
+                await self._rollback_quietly()
+                busy = _is_busy_error(exc)
+                if busy and attempt + 1 < _WRITE_RETRY_ATTEMPTS:
+                    delay_ms = random.uniform(
+                        0, min(_WRITE_RETRY_CAP_MS, _WRITE_RETRY_BASE_MS * 2**attempt)
+                    )
+                    attempt += 1
+                    await asyncio.sleep(delay_ms / 1000)
+                    continue
+                if not busy and len(batch) > 1:
+                    for item in batch:
+                        await self._run_write_batch([item])
+                    return
+                logger.error("Write batch of %d failed: %s", len(batch), exc)
+                _fail_pending(batch, exc)
+                return
+
+        for (_, future), (ok, value) in zip(batch, outcomes):
+            if future.done():
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    async def _rollback_quietly(self) -> None:
+        if not self.conn.in_transaction:
+            return
+        try:
+            await self.conn.rollback()
+        except aiosqlite.Error as exc:
+            logger.warning("Rollback of failed write batch failed: %s", exc)
+
+    async def _execute_write(
+        self, batch: list[tuple[WriteOp, asyncio.Future[Any]]]
+    ) -> list[tuple[bool, Any]]:
+        """Execute ``batch`` inside ``BEGIN IMMEDIATE ... COMMIT``.
+
+        Each op runs inside its own savepoint, so a failing op only rolls
+        back its own statements and the rest of the batch still commits.
+        """
+        conn = self.conn
+        outcomes: list[tuple[bool, Any]] = []
+        await conn.execute("BEGIN IMMEDIATE")
+        for op, _ in batch:
+            await conn.execute("SAVEPOINT write_op")
+            try:
+                outcomes.append((True, await op(conn)))
+            except Exception as exc:
+                if _is_busy_error(exc):
+                    raise
+                await conn.execute("ROLLBACK TO write_op")
+                outcomes.append((False, exc))
+            await conn.execute("RELEASE write_op")
+        await conn.execute("COMMIT")
+        return outcomes
+
     # ------------------------------------------------------------------
     # Agent operations
     # ------------------------------------------------------------------
@@ -103,9 +553,9 @@ class Database:
     ) -> None:
         session = session or {}
         metadata = session.get("metadata")
-        metadata_json = json.dumps(metadata) if metadata is not None else None
+        metadata_json = jsonio.dumps(metadata) if metadata is not None else None
 
-        await self.conn.execute(
+        await self._enqueue_write(
             """
             INSERT INTO agents (
                 agent_id,
@@ -155,78 +605,40 @@ class Database:
                 metadata_json,
             ),
         )
-        await self.conn.commit()
 
     async def touch_agent(self, agent_id: str) -> None:
-        await self.conn.execute(
-            """
-            UPDATE agents
-            SET last_active = CURRENT_TIMESTAMP, status = 'active'
-            WHERE agent_id = ?
-            """,
-            (agent_id,),
-        )
-        await self.conn.commit()
+        """Mark ``agent_id`` active; buffered and written within ``_BUFFER_FLUSH_SECONDS``."""
+        self._pending_touches.add(agent_id)
+        self._arm_buffer_flush()
 
     async def get_all_active_agents(self) -> list[str]:
-        cursor = await self.conn.execute(
-            "SELECT DISTINCT agent_id FROM agents WHERE status = 'active'"
-        )
-        rows = await cursor.fetchall()
+        rows = await self._fetchall("SELECT DISTINCT agent_id FROM agents WHERE status = 'active'")
         return [row["agent_id"] for row in rows]
 
     async def get_agent(self, agent_id: str) -> dict[str, Any] | None:
-        cursor = await self.conn.execute(
-            """
-            SELECT
-                agent_id,
-                agent_type,
-                client_name,
-                session_label,
-                user_id,
-                host,
-                pid,
-                cwd,
-                repo_root,
-                repo_name,
-                git_branch,
-                transport,
-                metadata,
-                first_seen,
-                last_active,
-                status
-            FROM agents
-            WHERE agent_id = ?
-            """,
+        row = await self._fetchone(
+            f"SELECT {_AGENT_COLUMNS} FROM agents WHERE agent_id = ?",
             (agent_id,),
         )
-        row = await cursor.fetchone()
         if not row:
             return None
         return self._agent_row_to_dict(row)
 
-    async def get_active_sessions(
-        self, stale_after_seconds: int = 90
-    ) -> list[dict[str, Any]]:
-        cursor = await self.conn.execute(
-            """
-            SELECT
-                agent_id,
-                agent_type,
-                client_name,
-                session_label,
-                user_id,
-                host,
-                pid,
-                cwd,
-                repo_root,
-                repo_name,
-                git_branch,
-                transport,
-                metadata,
-                first_seen,
-                last_active,
-                status
+    async def get_agents(self, agent_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Fetch several agents in one query, keyed by agent ID; unknown IDs are omitted."""
+        if not agent_ids:
+            return {}
+        placeholders = ",".join("?" * len(agent_ids))
+        rows = await self._fetchall(
+            f"SELECT {_AGENT_COLUMNS} FROM agents WHERE agent_id IN ({placeholders})",
+            agent_ids,
+        )
+        return {row["agent_id"]: self._agent_row_to_dict(row) for row in rows}
+
+    async def get_active_sessions(self, stale_after_seconds: int = 90) -> list[dict[str, Any]]:
+        rows = await self._fetchall(
+            f"""
+            SELECT {_AGENT_COLUMNS}
             FROM agents
             WHERE status = 'active'
               AND last_active >= datetime('now', ?)
@@ -234,11 +646,10 @@ class Database:
             """,
             (f"-{stale_after_seconds} seconds",),
         )
-        rows = await cursor.fetchall()
         return [self._agent_row_to_dict(row) for row in rows]
 
     async def mark_stale_agents_inactive(self, stale_after_seconds: int = 90) -> int:
-        cursor = await self.conn.execute(
+        cursor = await self._enqueue_write(
             """
             UPDATE agents
             SET status = 'inactive'
@@ -247,11 +658,14 @@ class Database:
             """,
             (f"-{stale_after_seconds} seconds",),
         )
-        await self.conn.commit()
         return cursor.rowcount
 
     async def set_agent_status(self, agent_id: str, status: str) -> None:
-        await self.conn.execute(
+        # A buffered touch also sets status='active'; queue it first so it
+        # cannot land after (and undo) this update.
+        if agent_id in self._pending_touches:
+            self._flush_buffered_writes()
+        await self._enqueue_write(
             """
             UPDATE agents
             SET status = ?
@@ -259,14 +673,13 @@ class Database:
             """,
             (status, agent_id),
         )
-        await self.conn.commit()
 
     def _agent_row_to_dict(self, row: aiosqlite.Row) -> dict[str, Any]:
         data = dict(row)
         raw_metadata = data.get("metadata")
         if raw_metadata:
             try:
-                data["metadata"] = json.loads(raw_metadata)
+                data["metadata"] = jsonio.loads(raw_metadata)
             except json.JSONDecodeError:
                 data["metadata"] = {"raw": raw_metadata}
         else:
@@ -278,11 +691,8 @@ class Database:
     # ------------------------------------------------------------------
 
     async def create_lock(self, lock: LockInfo) -> int:
-        cursor = await self.conn.execute(
-            """
-            INSERT INTO file_locks (file_path, agent_id, description, locked_at, expires_at, status)
-            VALUES (?, ?, ?, ?, ?, 'active')
-            """,
+        cursor = await self._enqueue_write(
+            _INSERT_LOCK_SQL,
             (
                 lock.file_path,
                 lock.agent_id,
@@ -291,49 +701,111 @@ class Database:
                 lock.expires_at.isoformat(),
             ),
         )
-        await self.conn.commit()
         return cursor.lastrowid  # type: ignore[return-value]
 
-    async def release_lock(self, file_path: str, agent_id: str) -> None:
-        await self.conn.execute(
-            """
-            UPDATE file_locks
-            SET status = 'released', released_at = ?
-            WHERE file_path = ? AND agent_id = ? AND status = 'active'
-            """,
-            (datetime.now().isoformat(), file_path, agent_id),
-        )
-        await self.conn.commit()
+    async def create_locks_bulk(
+        self, locks: list[LockInfo], *, renewed: Sequence[LockInfo] = ()
+    ) -> None:
+        """Insert several locks and their ``lock_acquired`` events in one transaction.
+
+        ``renewed`` locks already exist; only their expiry is updated, in the
+        same transaction.
+        """
+        if not locks and not renewed:
+            return
+
+        async def op(conn: aiosqlite.Connection) -> None:
+            if renewed:
+                await conn.executemany(
+                    _RENEW_LOCK_SQL,
+                    [(lock.expires_at.isoformat(), lock.file_path) for lock in renewed],
+                )
+            if not locks:
+                return
+            await conn.executemany(
+                _INSERT_LOCK_SQL,
+                [
+                    (
+                        lock.file_path,
+                        lock.agent_id,
+                        lock.description,
+                        lock.locked_at.isoformat(),
+                        lock.expires_at.isoformat(),
+                    )
+                    for lock in locks
+                ],
+            )
+            await conn.executemany(
+                _LOG_EVENT_SQL,
+                [
+                    (
+                        "lock_acquired",
+                        lock.agent_id,
+                        jsonio.dumps({"file": lock.file_path, "description": lock.description}),
+                    )
+                    for lock in locks
+                ],
+            )
+
+        await self._submit_write(op)
+
+    async def release_lock(
+        self, file_path: str, agent_id: str, *, with_event: bool = False
+    ) -> None:
+        """Mark a lock released, optionally logging ``lock_released`` in the same transaction."""
+
+        async def op(conn: aiosqlite.Connection) -> None:
+            await conn.execute(_RELEASE_LOCK_SQL, (file_path, agent_id))
+            if with_event:
+                await conn.execute(
+                    _LOG_EVENT_SQL, _event_params("lock_released", agent_id, {"file": file_path})
+                )
+
+        await self._submit_write(op)
+
+    async def release_locks(self, file_paths: list[str], agent_id: str) -> None:
+        """Mark several of an agent's locks released in one transaction."""
+        if not file_paths:
+            return
+
+        async def op(conn: aiosqlite.Connection) -> None:
+            await conn.executemany(
+                _RELEASE_LOCK_SQL, [(file_path, agent_id) for file_path in file_paths]
+            )
+
+        await self._submit_write(op)
 
     async def update_lock_expiry(self, file_path: str, new_expires_at: datetime) -> None:
-        await self.conn.execute(
-            """
-            UPDATE file_locks SET expires_at = ?
-            WHERE file_path = ? AND status = 'active'
-            """,
-            (new_expires_at.isoformat(), file_path),
-        )
-        await self.conn.commit()
+        await self._enqueue_write(_RENEW_LOCK_SQL, (new_expires_at.isoformat(), file_path))
 
-    async def get_active_locks(self) -> list[dict[str, Any]]:
-        cursor = await self.conn.execute(
+    async def get_active_locks(self) -> list[aiosqlite.Row]:
+        """Return active lock rows; rows support key access like a mapping."""
+        return await self._fetchall(
             """
             SELECT file_path, agent_id, description, locked_at, expires_at
             FROM file_locks WHERE status = 'active'
             """
         )
-        rows = await cursor.fetchall()
-        return [dict(row) for row in rows]
 
     async def cleanup_expired_locks(self) -> int:
-        cursor = await self.conn.execute(
+        # Cheap read-only probe on idx_locks_expires first, so the steady
+        # state (nothing expired) never opens a write transaction.
+        probe = await self._fetchone(
+            f"""
+            SELECT 1 FROM file_locks
+            WHERE status = 'active' AND expires_at < {_SQL_NOW_ISO}
+            LIMIT 1
             """
+        )
+        if probe is None:
+            return 0
+
+        cursor = await self._enqueue_write(
+            f"""
             UPDATE file_locks SET status = 'expired'
-            WHERE status = 'active' AND expires_at < ?
-            """,
-            (datetime.now().isoformat(),),
+            WHERE status = 'active' AND expires_at < {_SQL_NOW_ISO}
+            """
         )
-        await self.conn.commit()
         return cursor.rowcount
 
     # ------------------------------------------------------------------
@@ -341,71 +813,86 @@ class Database:
     # ------------------------------------------------------------------
 
     async def create_work_item(
-        self, agent_id: str, description: str, files: list[str]
+        self, agent_id: str, description: str, files: list[str], *, with_event: bool = False
     ) -> int:
-        cursor = await self.conn.execute(
-            """
-            INSERT INTO work_items (agent_id, description, files, status)
-            VALUES (?, ?, ?, 'in_progress')
-            """,
-            (agent_id, description, json.dumps(files)),
-        )
-        await self.conn.commit()
-        return cursor.lastrowid  # type: ignore[return-value]
+        """Insert a work item, optionally logging ``work_started`` in the same transaction."""
+
+        async def op(conn: aiosqlite.Connection) -> int:
+            cursor = await conn.execute(
+                _INSERT_WORK_ITEM_SQL, (agent_id, description, jsonio.dumps(files))
+            )
+            work_id = cursor.lastrowid
+            await conn.executemany(
+                _INSERT_WORK_ITEM_FILE_SQL,
+                [(work_id, position, path) for position, path in enumerate(files)],
+            )
+            if with_event:
+                await conn.execute(
+                    _LOG_EVENT_SQL,
+                    _event_params(
+                        "work_started",
+                        agent_id,
+                        {"work_id": work_id, "description": description, "files": files},
+                    ),
+                )
+            return work_id  # type: ignore[return-value]
+
+        return await self._submit_write(op)
 
     async def complete_work_item(
-        self, agent_id: str, commit_hash: str | None = None
+        self, agent_id: str, commit_hash: str | None = None, *, with_event: bool = False
     ) -> bool:
-        cursor = await self.conn.execute(
-            """
-            SELECT id FROM work_items
-            WHERE agent_id = ? AND status = 'in_progress'
-            ORDER BY started_at DESC LIMIT 1
-            """,
-            (agent_id,),
-        )
-        row = await cursor.fetchone()
-        if not row:
-            return False
+        """Complete the agent's latest work item, optionally logging ``work_completed``."""
 
-        await self.conn.execute(
-            """
-            UPDATE work_items
-            SET status = 'completed', completed_at = ?, commit_hash = ?
-            WHERE id = ?
-            """,
-            (datetime.now().isoformat(), commit_hash, row["id"]),
-        )
-        await self.conn.commit()
-        return True
+        async def op(conn: aiosqlite.Connection) -> bool:
+            cursor = await conn.execute(
+                f"""
+                UPDATE work_items
+                SET status = 'completed', completed_at = {_SQL_NOW_ISO}, commit_hash = ?
+                WHERE id = (
+                    SELECT id FROM work_items
+                    WHERE agent_id = ? AND status = 'in_progress'
+                    ORDER BY started_at DESC, id DESC LIMIT 1
+                )
+                """,
+                (commit_hash, agent_id),
+            )
+            completed = cursor.rowcount > 0
+            if completed and with_event:
+                await conn.execute(
+                    _LOG_EVENT_SQL,
+                    _event_params("work_completed", agent_id, {"commit_hash": commit_hash}),
+                )
+            return completed
 
-    async def get_active_work_items(
-        self, agent_id: str | None = None
-    ) -> list[dict[str, Any]]:
+        return await self._submit_write(op)
+
+    async def get_active_work_items(self, agent_id: str | None = None) -> list[dict[str, Any]]:
+        """Return in-progress work items, already shaped for the MCP layer."""
         if agent_id:
-            cursor = await self.conn.execute(
+            rows = await self._fetchall(
                 """
-                SELECT id, agent_id, description, files, started_at, status
+                SELECT id AS work_id, agent_id, description, started_at, status
                 FROM work_items WHERE agent_id = ? AND status = 'in_progress'
                 ORDER BY started_at DESC
                 """,
                 (agent_id,),
             )
         else:
-            cursor = await self.conn.execute(
+            rows = await self._fetchall(
                 """
-                SELECT id, agent_id, description, files, started_at, status
+                SELECT id AS work_id, agent_id, description, started_at, status
                 FROM work_items WHERE status = 'in_progress'
                 ORDER BY started_at DESC
                 """
             )
-        rows = await cursor.fetchall()
-        result = []
-        for row in rows:
-            d = dict(row)
-            d["files"] = json.loads(d["files"]) if d["files"] else []
-            result.append(d)
-        return result
+        items = [dict(row) for row in rows]
+        files = await self._files_by_parent(
+            "work_item_files", "work_item_id", [item["work_id"] for item in items]
+        )
+        for item in items:
+            item["files"] = files[item["work_id"]]
+        return items
 
     # ------------------------------------------------------------------
     # Action operations
@@ -418,41 +905,97 @@ class Database:
         files: list[str],
         intent: str,
     ) -> int:
-        cursor = await self.conn.execute(
-            """
-            INSERT INTO agent_actions (agent_id, action_type, files, intent)
-            VALUES (?, ?, ?, ?)
-            """,
-            (agent_id, action_type, json.dumps(files), intent),
-        )
-        await self.conn.commit()
-        return cursor.lastrowid  # type: ignore[return-value]
+        async def op(conn: aiosqlite.Connection) -> int:
+            cursor = await conn.execute(
+                _INSERT_ACTION_SQL, (agent_id, action_type, jsonio.dumps(files), intent)
+            )
+            action_id = cursor.lastrowid
+            await conn.executemany(
+                _INSERT_ACTION_FILE_SQL,
+                [(action_id, position, path) for position, path in enumerate(files)],
+            )
+            return action_id  # type: ignore[return-value]
+
+        return await self._submit_write(op)
+
+    async def register_actions_bulk(
+        self, actions: list[tuple[str, str, list[str], str]]
+    ) -> list[int]:
+        """Insert several ``(agent_id, action_type, files, intent)`` actions in one write."""
+        if not actions:
+            return []
+
+        async def op(conn: aiosqlite.Connection) -> list[int]:
+            action_ids: list[int] = []
+            file_rows: list[tuple[int, int, str]] = []
+            for agent_id, action_type, files, intent in actions:
+                cursor = await conn.execute(
+                    _INSERT_ACTION_SQL, (agent_id, action_type, jsonio.dumps(files), intent)
+                )
+                action_id: int = cursor.lastrowid  # type: ignore[assignment]
+                action_ids.append(action_id)
+                file_rows.extend((action_id, position, path) for position, path in enumerate(files))
+            await conn.executemany(_INSERT_ACTION_FILE_SQL, file_rows)
+            return action_ids
+
+        return await self._submit_write(op)
 
     async def get_recent_actions(
         self,
         file_path: str | None = None,
         hours: int = 24,
+        limit: int = _RECENT_ACTIONS_LIMIT,
+        before_id: int | None = None,
     ) -> list[dict[str, Any]]:
-        cursor = await self.conn.execute(
-            """
-            SELECT id, agent_id, action_type, files, intent, created_at
-            FROM agent_actions
-            WHERE created_at > datetime('now', ?)
-            ORDER BY created_at DESC
-            LIMIT 100
-            """,
-            (f"-{hours} hours",),
+        actions, _ = await self.get_recent_actions_page(
+            file_path, hours, limit=limit, before_id=before_id
         )
-        rows = await cursor.fetchall()
-
-        actions = []
-        for row in rows:
-            d = dict(row)
-            d["files"] = json.loads(d["files"]) if d["files"] else []
-            if file_path is None or file_path in d["files"]:
-                actions.append(d)
         return actions
 
+    async def get_recent_actions_page(
+        self,
+        file_path: str | None = None,
+        hours: int = 24,
+        *,
+        limit: int = _RECENT_ACTIONS_LIMIT,
+        before_id: int | None = None,
+    ) -> tuple[list[dict[str, Any]], int | None]:
+        """Return one page of recent actions, newest first, plus the next cursor.
+
+        Pass the returned cursor back as ``before_id`` to fetch the next
+        page; it is ``None`` once there are no more rows.
+        """
+        conditions = ["a.created_at > datetime('now', ?)"]
+        params: list[Any] = [f"-{hours} hours"]
+        if before_id is not None:
+            conditions.append("a.id < ?")
+            params.append(before_id)
+        if file_path is not None:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM action_files f WHERE f.action_id = a.id AND f.file_path = ?)"
+            )
+            params.append(file_path)
+        params.append(limit)
+
+        rows = await self._fetchall(
+            f"""
+            SELECT a.id, a.agent_id, a.action_type, a.intent, a.created_at
+            FROM agent_actions a
+            WHERE {" AND ".join(conditions)}
+            ORDER BY a.id DESC
+            LIMIT ?
+            """,
+            params,
+        )
+        actions = [dict(row) for row in rows]
+        files = await self._files_by_parent(
+            "action_files", "action_id", [action["id"] for action in actions]
+        )
+        for action in actions:
+            action["files"] = files[action["id"]]
+        next_before_id = actions[-1]["id"] if len(actions) == limit else None
+        return actions, next_before_id
+
     # ------------------------------------------------------------------
     # Conflict operations
     # ------------------------------------------------------------------
@@ -466,7 +1009,7 @@ class Database:
         severity: str,
         description: str,
     ) -> int:
-        cursor = await self.conn.execute(
+        cursor = await self._enqueue_write(
             """
             INSERT INTO conflicts
                 (file_path, agent1_id, agent2_id, conflict_type, severity, description)
@@ -474,7 +1017,6 @@ class Database:
             """,
             (file_path, agent1_id, agent2_id, conflict_type, severity, description),
         )
-        await self.conn.commit()
         return cursor.lastrowid  # type: ignore[return-value]
 
     # ------------------------------------------------------------------
@@ -484,11 +1026,35 @@ class Database:
     async def log_event(
         self, event_type: str, agent_id: str | None, details: dict[str, Any] | None = None
     ) -> None:
-        await self.conn.execute(
-            """
-            INSERT INTO event_log (event_type, agent_id, details)
-            VALUES (?, ?, ?)
-            """,
-            (event_type, agent_id, json.dumps(details) if details else None),
-        )
-        await self.conn.commit()
+        await self._enqueue_write(_LOG_EVENT_SQL, _event_params(event_type, agent_id, details))
+
+    def log_event_nowait(
+        self, event_type: str, agent_id: str | None, details: dict[str, Any] | None = None
+    ) -> None:
+        """Buffer a telemetry event; written within ``_BUFFER_FLUSH_SECONDS`` or on flush."""
+        self._pending_events.append(_event_params(event_type, agent_id, details))
+        self._arm_buffer_flush()
+
+
+def _event_params(
+    event_type: str, agent_id: str | None, details: dict[str, Any] | None
+) -> tuple[str, str | None, str | None]:
+    return (event_type, agent_id, jsonio.dumps(details) if details else None)
+
+
+def _log_buffered_write_failure(future: asyncio.Future[Any]) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.warning("Failed to write buffered activity/events: %s", future.exception())
+
+
+def _fail_pending(batch: list[tuple[WriteOp, asyncio.Future[Any]]], exc: BaseException) -> None:
+    for _, future in batch:
+        if not future.done():
+            future.set_exception(exc)
+
+
+def _is_busy_error(exc: BaseException) -> bool:
+    if not isinstance(exc, aiosqlite.OperationalError):
+        return False
+    message = str(exc).lower()
+    return "locked" in message or "busy" in message
@@ -36,7 +36,8 @@ CREATE TABLE IF NOT EXISTS file_locks (
 
 CREATE INDEX IF NOT EXISTS idx_locks_file_path ON file_locks(file_path);
 CREATE INDEX IF NOT EXISTS idx_locks_agent_id ON file_locks(agent_id);
-CREATE INDEX IF NOT EXISTS idx_locks_status ON file_locks(status);
+CREATE INDEX IF NOT EXISTS idx_locks_active ON file_locks(file_path) WHERE status = 'active';
+CREATE INDEX IF NOT EXISTS idx_locks_expires ON file_locks(expires_at) WHERE status = 'active';
 
 -- Work items table
 CREATE TABLE IF NOT EXISTS work_items (
@@ -52,7 +53,17 @@ CREATE TABLE IF NOT EXISTS work_items (
 );
 
 CREATE INDEX IF NOT EXISTS idx_work_agent_id ON work_items(agent_id);
-CREATE INDEX IF NOT EXISTS idx_work_status ON work_items(status);
+CREATE INDEX IF NOT EXISTS idx_work_active ON work_items(agent_id, started_at) WHERE status = 'in_progress';
+
+-- Files touched by each work item (work_items.files is kept for older readers)
+CREATE TABLE IF NOT EXISTS work_item_files (
+    work_item_id INTEGER NOT NULL REFERENCES work_items(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    file_path TEXT NOT NULL,
+    PRIMARY KEY (work_item_id, position)
+);
+
+CREATE INDEX IF NOT EXISTS idx_work_item_files_path ON work_item_files(file_path, work_item_id);
 
 -- Agent actions table (for semantic conflict detection)
 CREATE TABLE IF NOT EXISTS agent_actions (
@@ -68,6 +79,16 @@ CREATE TABLE IF NOT EXISTS agent_actions (
 CREATE INDEX IF NOT EXISTS idx_actions_agent_id ON agent_actions(agent_id);
 CREATE INDEX IF NOT EXISTS idx_actions_created_at ON agent_actions(created_at);
 
+-- Files touched by each action (agent_actions.files is kept for older readers)
+CREATE TABLE IF NOT EXISTS action_files (
+    action_id INTEGER NOT NULL REFERENCES agent_actions(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    file_path TEXT NOT NULL,
+    PRIMARY KEY (action_id, position)
+);
+
+CREATE INDEX IF NOT EXISTS idx_action_files_path ON action_files(file_path, action_id);
+
 -- Conflicts table
 CREATE TABLE IF NOT EXISTS conflicts (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
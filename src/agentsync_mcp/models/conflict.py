@@ -1,11 +1,12 @@
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel, Field
 
 
-class Conflict(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class Conflict:
     """Represents a detected conflict between two agents' work."""
 
     id: int | None = None
@@ -15,7 +16,7 @@ class Conflict(BaseModel):
     conflict_type: str  # textual, semantic
     severity: str = "medium"  # low, medium, high
     description: Optional[str] = None
-    detected_at: datetime = Field(default_factory=datetime.now)
+    detected_at: datetime = field(default_factory=datetime.now)
     resolved_at: Optional[datetime] = None
     resolution_strategy: Optional[str] = None
     status: str = "open"  # open, resolved, ignored
@@ -1,17 +1,47 @@
 from __future__ import annotations
 
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
-from pydantic import BaseModel, Field
+from typing import Any
 
 
-class LockInfo(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class LockInfo:
     """Represents an active file lock."""
 
     file_path: str
     agent_id: str
     description: str
-    locked_at: datetime = Field(default_factory=datetime.now)
+    locked_at: datetime = field(default_factory=datetime.now)
     expires_at: datetime
+    # Unix timestamp of ``expires_at`` for cheap expiry comparisons.
+    expires_ts: float = field(init=False, repr=False, compare=False)
+    _dump: dict[str, Any] | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.expires_ts = self.expires_at.timestamp()
 
     def is_expired(self) -> bool:
-        return datetime.now() >= self.expires_at
+        return time.time() >= self.expires_ts
+
+    def renew(self, expires_at: datetime) -> None:
+        """Move the expiry and drop the cached :meth:`to_dict` output."""
+        self.expires_at = expires_at
+        self.expires_ts = expires_at.timestamp()
+        self._dump = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-ready representation with ISO-formatted timestamps.
+
+        The formatted dict is cached until :meth:`renew`; callers get a copy.
+        """
+        if self._dump is None:
+            self._dump = {
+                "file_path": self.file_path,
+                "agent_id": self.agent_id,
+                "description": self.description,
+                "locked_at": self.locked_at.isoformat(),
+                "expires_at": self.expires_at.isoformat(),
+            }
+        return dict(self._dump)
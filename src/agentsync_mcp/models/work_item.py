@@ -1,19 +1,20 @@
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel, Field
 
 
-class WorkItem(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class WorkItem:
     """Represents a tracked unit of work being performed by an agent."""
 
     id: int | None = None
     agent_id: str
     description: str
-    files: list[str] = Field(default_factory=list)
+    files: list[str] = field(default_factory=list)
     status: str = "in_progress"  # pending, in_progress, completed, failed
     priority: int = 0
-    started_at: datetime = Field(default_factory=datetime.now)
+    started_at: datetime = field(default_factory=datetime.now)
     completed_at: Optional[datetime] = None
     commit_hash: Optional[str] = None
@@ -21,6 +21,9 @@ from agentsync_mcp.utils.logger import setup_logging
 
 logger = logging.getLogger(__name__)
 
+# How often the heartbeat loop asks SQLite to refresh planner statistics.
+_OPTIMIZE_INTERVAL_SECONDS = 3600
+
 
 async def _session_heartbeat_loop(
     db: Database,
@@ -28,15 +31,20 @@ async def _session_heartbeat_loop(
     interval_seconds: int,
     stale_after_seconds: int,
 ) -> None:
-    """Keep the current session fresh and expire stale sessions."""
+    """Keep the current session fresh, expire stale sessions, and periodically optimize the DB."""
     agent_id = session["agent_id"]
     agent_type = session.get("agent_type", "unknown")
+    loop = asyncio.get_running_loop()
+    last_optimize = loop.time()
     while True:
         await asyncio.sleep(interval_seconds)
         await db.register_agent(agent_id, agent_type, session=session)
         cleaned = await db.mark_stale_agents_inactive(stale_after_seconds)
         if cleaned:
             logger.info("Marked %d stale agent sessions inactive", cleaned)
+        if loop.time() - last_optimize >= _OPTIMIZE_INTERVAL_SECONDS:
+            await db.optimize()
+            last_optimize = loop.time()
 
 
 @asynccontextmanager
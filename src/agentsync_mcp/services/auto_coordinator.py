@@ -1,50 +1,207 @@
 from __future__ import annotations
 
 import asyncio
+import bisect
+import logging
 import os
 import shlex
 import signal
 import socket
 import subprocess
+import time
 import uuid
+from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
 from agentsync_mcp.db.database import Database
 from agentsync_mcp.services.identity import detect_agent_session_identity
 from agentsync_mcp.services.lock_manager import LockManager
 
+logger = logging.getLogger(__name__)
 
-def _git_status_dirty_files(repo_root: Path) -> set[str]:
-    """Return dirty/untracked files from git status porcelain output."""
+# The status cache is keyed on .git/index and HEAD, which worktree-only
+# edits leave alone. The poll loop therefore only uses it with a watcher,
+# whose change events bypass it; entries are also bounded by age.
+_STATUS_CACHE_TTL_SECONDS = 5.0
+
+# Quiet period after a watched change before status is re-read, so a burst
+# of writes costs one status call.
+_WATCH_DEBOUNCE_SECONDS = 0.1
+
+# Watchdog event types that can change git status; open/close notifications
+# (including the reads status itself performs) are ignored.
+_WATCHED_EVENT_TYPES = frozenset({"created", "deleted", "modified", "moved"})
+
+_StatusKey = tuple[int, int, int, int]
+_STATUS_CACHE: dict[Path, tuple[_StatusKey, float, frozenset[str]]] = {}
+
+
+def _git_dir(repo_root: Path) -> Path:
+    """Return the git directory for a repo root, following worktree ``.git`` files."""
+    dot_git = repo_root / ".git"
+    if dot_git.is_file():
+        try:
+            content = dot_git.read_text().strip()
+        except OSError:
+            return dot_git
+        if content.startswith("gitdir:"):
+            git_dir = Path(content[len("gitdir:") :].strip())
+            return git_dir if git_dir.is_absolute() else repo_root / git_dir
+    return dot_git
+
+
+def _stat_key(path: Path) -> tuple[int, int]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return (0, 0)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _git_status_cache_key(repo_root: Path) -> _StatusKey:
+    git_dir = _git_dir(repo_root)
+    return _stat_key(git_dir / "index") + _stat_key(git_dir / "HEAD")
+
+
+def _read_git_status(repo_root: Path, repo: Any | None = None) -> set[str] | None:
+    """Read dirty/untracked files, in-process when ``repo`` is an open pygit2 repository."""
+    return _pygit2_status(repo) if repo is not None else _run_git_status(repo_root)
+
+
+def _git_status_dirty_files(
+    repo_root: Path, repo: Any | None = None, use_cache: bool = True
+) -> set[str]:
+    """Return dirty/untracked files, reusing the last result while the index and HEAD are unchanged.
+
+    When ``repo`` is an open pygit2 repository, status is read in-process
+    instead of by running ``git status``. Pass ``use_cache=False`` when the
+    worktree is known to have changed.
+    """
+    key = _git_status_cache_key(repo_root)
+    now = time.monotonic()
+    cached = _STATUS_CACHE.get(repo_root) if use_cache else None
+    if cached is not None:
+        cached_key, cached_at, cached_files = cached
+        if cached_key == key and (now - cached_at) < _STATUS_CACHE_TTL_SECONDS:
+            return set(cached_files)
+
+    files = _read_git_status(repo_root, repo)
+    if files is None:
+        _STATUS_CACHE.pop(repo_root, None)
+        return set()
+    _STATUS_CACHE[repo_root] = (key, now, frozenset(files))
+    return files
+
+
+def _start_watcher(repo_root: Path, on_change: Callable[[], None]) -> Any | None:
+    """Watch ``repo_root`` with watchdog when it is installed, else return None.
+
+    ``on_change`` is called from the observer thread for worktree changes and
+    for updates to the index or HEAD; the rest of ``.git`` is ignored.
+    """
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        return None
+
+    git_dir = _git_dir(repo_root)
+    git_prefix = str(git_dir) + os.sep
+    git_state = {str(git_dir / "index"), str(git_dir / "HEAD")}
+
+    def relevant(path: str) -> bool:
+        return bool(path) and (not path.startswith(git_prefix) or path in git_state)
+
+    class _ChangeHandler(FileSystemEventHandler):
+        def on_any_event(self, event: Any) -> None:
+            if event.event_type not in _WATCHED_EVENT_TYPES:
+                return
+            if relevant(os.fsdecode(event.src_path)) or relevant(
+                os.fsdecode(getattr(event, "dest_path", "") or "")
+            ):
+                on_change()
+
+    observer = Observer()
+    try:
+        observer.schedule(_ChangeHandler(), str(repo_root), recursive=True)
+        observer.start()
+    except OSError:
+        # e.g. the inotify watch limit is exhausted; fall back to polling.
+        return None
+    return observer
+
+
+def _open_pygit2_repository(repo_root: Path) -> Any | None:
+    """Open ``repo_root`` with pygit2 when it is installed, else return None."""
+    try:
+        import pygit2
+    except ImportError:
+        return None
+    try:
+        return pygit2.Repository(str(repo_root))
+    except pygit2.GitError:
+        return None
+
+
+def _pygit2_status(repo: Any) -> set[str] | None:
+    import pygit2
+
+    try:
+        status = repo.status()
+    except pygit2.GitError:
+        return None
+    return {path for path, flags in status.items() if flags & ~pygit2.GIT_STATUS_IGNORED}
+
+
+# Number of space-separated fields preceding the path in porcelain v2 records.
+_PORCELAIN_V2_PATH_FIELD = {b"1": 8, b"2": 9, b"u": 10}
+
+
+def _run_git_status(repo_root: Path) -> set[str] | None:
+    """Return dirty/untracked files from ``git status --porcelain=v2 -z`` output."""
     proc = subprocess.run(
         [
             "git",
+            "--no-optional-locks",
             "-C",
             str(repo_root),
+            "-c",
+            "core.untrackedCache=true",
             "status",
-            "--porcelain=v1",
+            "--porcelain=v2",
+            "-z",
             "--untracked-files=all",
         ],
         capture_output=True,
-        text=True,
         check=False,
     )
     if proc.returncode != 0:
-        return set()
+        return None
+    return _parse_porcelain_v2(proc.stdout)
 
+
+def _parse_porcelain_v2(output: bytes) -> set[str]:
     files: set[str] = set()
-    for raw_line in proc.stdout.splitlines():
-        line = raw_line.rstrip()
-        if not line:
+    records = iter(output.split(b"\0"))
+    for record in records:
+        if not record:
+            continue
+        kind = record[:1]
+        if kind == b"?":
+            files.add(os.fsdecode(record[2:]))
+            continue
+        field = _PORCELAIN_V2_PATH_FIELD.get(kind)
+        if field is None:
             continue
-        if len(line) < 4:
+        parts = record.split(b" ", field)
+        if len(parts) <= field:
             continue
-        path_part = line[3:]
-        if " -> " in path_part:
-            _, new_path = path_part.split(" -> ", 1)
-            path_part = new_path
-        files.add(path_part)
+        files.add(os.fsdecode(parts[field]))
+        if kind == b"2":
+            # Renames and copies carry the original path as the next record.
+            next(records, None)
     return files
 
 
@@ -65,9 +222,13 @@ class AutoCoordinator:
     def __init__(self, options: AutoCoordinationOptions):
         self.options = options
         self.repo_root = self._resolve_repo_root()
-        self.baseline_dirty_files = _git_status_dirty_files(self.repo_root)
+        self._repo = _open_pygit2_repository(self.repo_root)
+        self.baseline_dirty_files = _git_status_dirty_files(self.repo_root, self._repo)
         self.auto_locked_files: set[str] = set()
+        self._auto_locked_sorted: list[str] = []
         self._last_renewal: float = 0.0
+        self._status_lock = asyncio.Lock()
+        self._dirty_event: asyncio.Event | None = None
 
     def _resolve_repo_root(self) -> Path:
         proc = subprocess.run(
@@ -86,7 +247,9 @@ class AutoCoordinator:
 
         db = Database(self.options.db_path)
         await db.initialize()
-        lock_manager = LockManager(db, cleanup_interval=max(30, int(self.options.poll_interval * 10)))
+        lock_manager = LockManager(
+            db, cleanup_interval=max(30, int(self.options.poll_interval * 10))
+        )
         await lock_manager.start()
 
         agent_id = session_meta["agent_id"]
@@ -102,6 +265,13 @@ class AutoCoordinator:
         loop = asyncio.get_running_loop()
         stop_event = asyncio.Event()
 
+        dirty_event = asyncio.Event()
+        observer = _start_watcher(
+            self.repo_root, lambda: loop.call_soon_threadsafe(dirty_event.set)
+        )
+        if observer is not None:
+            self._dirty_event = dirty_event
+
         def _handle_signal() -> None:
             stop_event.set()
             if proc.returncode is None:
@@ -123,6 +293,10 @@ class AutoCoordinator:
             await self._event_loop(proc, db, lock_manager, stop_event, agent_id)
             code = await proc.wait()
         finally:
+            if observer is not None:
+                observer.stop()
+                await asyncio.to_thread(observer.join)
+                self._dirty_event = None
             await self._release_all_auto_locks(lock_manager, db, agent_id)
             await db.set_agent_status(agent_id, "inactive")
             await lock_manager.stop()
@@ -148,49 +322,118 @@ class AutoCoordinator:
         renew_every = max(3.0, min(self.options.ttl_seconds / 2, 60.0))
         heartbeat_every = max(2.0, self.options.heartbeat_interval)
         last_heartbeat = 0.0
+        # With a watcher, status is re-read on change and otherwise only as
+        # often as renewal and heartbeats need the loop to run.
+        idle_wait = min(renew_every, heartbeat_every)
+        changed = False
 
-        while proc.returncode is None:
-            now = asyncio.get_running_loop().time()
-
-            dirty_files = _git_status_dirty_files(self.repo_root)
-            dirty_files = {
-                p for p in dirty_files if p and not p.startswith(".git/")
-            }
-            session_dirty_files = dirty_files - self.baseline_dirty_files
-
-            new_dirty = [p for p in sorted(session_dirty_files - self.auto_locked_files)]
-            for file_path in new_dirty:
-                await self._acquire_auto_lock(lock_manager, db, agent_id, file_path)
-
-            cleaned = [p for p in sorted(self.auto_locked_files - session_dirty_files)]
-            for file_path in cleaned:
-                released = await lock_manager.release_lock(file_path, agent_id)
-                if released:
-                    self.auto_locked_files.discard(file_path)
-                    await db.log_event("auto_lock_released_clean", agent_id, {"file": file_path})
-
-            if self.auto_locked_files and (now - self._last_renewal) >= renew_every:
-                for file_path in sorted(self.auto_locked_files):
-                    await lock_manager.acquire_lock(
-                        file_path=file_path,
-                        agent_id=agent_id,
-                        description=self._lock_description(),
-                        ttl_seconds=self.options.ttl_seconds,
-                    )
-                self._last_renewal = now
-
-            if (now - last_heartbeat) >= heartbeat_every:
-                await db.touch_agent(agent_id)
-                await db.mark_stale_agents_inactive()
-                last_heartbeat = now
-
-            try:
-                await asyncio.wait_for(proc.wait(), timeout=self.options.poll_interval)
-            except asyncio.TimeoutError:
-                pass
+        child_exit = asyncio.ensure_future(proc.wait())
+        status_task: asyncio.Task[set[str]] | None = None
+        try:
+            while not child_exit.done():
+                now = asyncio.get_running_loop().time()
+
+                # Overlap the status read with waiting on the child so an exit
+                # mid-poll ends the loop at once. A status read slower than the
+                # poll interval is left running and picked up on a later tick.
+                if status_task is None:
+                    status_task = asyncio.create_task(self._poll_dirty_files(use_cache=not changed))
+                await asyncio.wait(
+                    {status_task, child_exit},
+                    timeout=self.options.poll_interval,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if child_exit.done():
+                    break
+
+                polled = status_task.done()
+                if polled:
+                    dirty_files = status_task.result()
+                    status_task = None
+                    await self._sync_dirty_files(dirty_files, lock_manager, db, agent_id)
+
+                if self.auto_locked_files and (now - self._last_renewal) >= renew_every:
+                    for file_path in self._auto_locked_sorted:
+                        await lock_manager.acquire_lock(
+                            file_path=file_path,
+                            agent_id=agent_id,
+                            description=self._lock_description(),
+                            ttl_seconds=self.options.ttl_seconds,
+                        )
+                    self._last_renewal = now
+
+                if (now - last_heartbeat) >= heartbeat_every:
+                    await db.touch_agent(agent_id)
+                    await db.mark_stale_agents_inactive()
+                    last_heartbeat = now
+
+                if polled:
+                    if self._dirty_event is None:
+                        await asyncio.wait({child_exit}, timeout=self.options.poll_interval)
+                    else:
+                        changed = await self._wait_for_change(child_exit, idle_wait)
+
+                if stop_event.is_set() and proc.returncode is not None:
+                    break
+        finally:
+            if status_task is not None:
+                status_task.cancel()
+            if not child_exit.done():
+                child_exit.cancel()
 
-            if stop_event.is_set() and proc.returncode is not None:
-                break
+    async def _sync_dirty_files(
+        self,
+        dirty_files: set[str],
+        lock_manager: LockManager,
+        db: Database,
+        agent_id: str,
+    ) -> None:
+        dirty_files = {p for p in dirty_files if p and not p.startswith(".git/")}
+        session_dirty_files = dirty_files - self.baseline_dirty_files
+
+        for file_path in session_dirty_files - self.auto_locked_files:
+            await self._acquire_auto_lock(lock_manager, db, agent_id, file_path)
+
+        cleaned = [p for p in self._auto_locked_sorted if p not in session_dirty_files]
+        for file_path in cleaned:
+            released = await lock_manager.release_lock(file_path, agent_id)
+            if released:
+                self._untrack_auto_lock(file_path)
+                db.log_event_nowait("auto_lock_released_clean", agent_id, {"file": file_path})
+
+    async def _poll_dirty_files(self, use_cache: bool = True) -> set[str]:
+        """Read git status on a worker thread, one poll at a time.
+
+        Without a watcher nothing reports worktree-only edits, so every poll
+        reads status afresh instead of going through the index/HEAD cache.
+        """
+        async with self._status_lock:
+            if self._dirty_event is None:
+                files = await asyncio.to_thread(_read_git_status, self.repo_root, self._repo)
+                return files or set()
+            return await asyncio.to_thread(
+                _git_status_dirty_files, self.repo_root, self._repo, use_cache
+            )
+
+    async def _wait_for_change(self, child_exit: asyncio.Future[int], timeout: float) -> bool:
+        """Wait for a watched change, the child exiting, or ``timeout``.
+
+        Returns True when a change was seen, after a short debounce so a
+        burst of writes is picked up by a single status read.
+        """
+        assert self._dirty_event is not None
+        change = asyncio.ensure_future(self._dirty_event.wait())
+        try:
+            await asyncio.wait(
+                {change, child_exit}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            change.cancel()
+        if child_exit.done() or not self._dirty_event.is_set():
+            return False
+        await asyncio.wait({child_exit}, timeout=_WATCH_DEBOUNCE_SECONDS)
+        self._dirty_event.clear()
+        return True
 
     async def _acquire_auto_lock(
         self,
@@ -206,17 +449,14 @@ class AutoCoordinator:
             ttl_seconds=self.options.ttl_seconds,
         )
         if result.get("success"):
-            self.auto_locked_files.add(file_path)
-            await db.log_event("auto_lock_acquired", agent_id, {"file": file_path})
+            self._track_auto_lock(file_path)
+            db.log_event_nowait("auto_lock_acquired", agent_id, {"file": file_path})
             return
 
         blocked_by = result.get("locked_by", "unknown")
-        msg = (
-            f"[agentsync] lock conflict on {file_path} "
-            f"(held by {blocked_by})"
-        )
+        msg = f"[agentsync] lock conflict on {file_path} (held by {blocked_by})"
         print(msg, flush=True)
-        await db.log_event(
+        db.log_event_nowait(
             "auto_lock_conflict",
             agent_id,
             {
@@ -229,10 +469,34 @@ class AutoCoordinator:
     async def _release_all_auto_locks(
         self, lock_manager: LockManager, db: Database, agent_id: str
     ) -> None:
-        for file_path in sorted(self.auto_locked_files):
-            await lock_manager.release_lock(file_path, agent_id)
-            await db.log_event("auto_lock_released_exit", agent_id, {"file": file_path})
+        await asyncio.gather(
+            *(
+                self._release_one(lock_manager, db, agent_id, file_path)
+                for file_path in self._auto_locked_sorted
+            )
+        )
         self.auto_locked_files.clear()
+        self._auto_locked_sorted.clear()
+
+    async def _release_one(
+        self, lock_manager: LockManager, db: Database, agent_id: str, file_path: str
+    ) -> None:
+        try:
+            await lock_manager.release_lock(file_path, agent_id)
+        except Exception as exc:  # noqa: BLE001 - one failed release must not skip the rest
+            logger.warning("Failed to release auto-lock on %s: %s", file_path, exc)
+            return
+        db.log_event_nowait("auto_lock_released_exit", agent_id, {"file": file_path})
+
+    def _track_auto_lock(self, file_path: str) -> None:
+        if file_path not in self.auto_locked_files:
+            self.auto_locked_files.add(file_path)
+            bisect.insort(self._auto_locked_sorted, file_path)
+
+    def _untrack_auto_lock(self, file_path: str) -> None:
+        if file_path in self.auto_locked_files:
+            self.auto_locked_files.discard(file_path)
+            del self._auto_locked_sorted[bisect.bisect_left(self._auto_locked_sorted, file_path)]
 
     def _lock_description(self) -> str:
         if self.options.description:
@@ -1,15 +1,44 @@
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
 from typing import Any
 
 from agentsync_mcp.db.database import Database
 from agentsync_mcp.services.work_queue import WorkQueue
+from agentsync_mcp.utils import jsonio
 from agentsync_mcp.utils.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on LLM conflict checks in flight for one detection call.
+_MAX_CONCURRENT_CHECKS = 8
+
+# Static instructions appended to the per-request part of each prompt.
+_CONFLICT_CHECK_INSTRUCTIONS = (
+    "Do these changes conflict? Consider:\n"
+    "- Are they modifying the same functionality?\n"
+    "- Could they introduce logical contradictions?\n"
+    "- Would both changes be compatible?\n\n"
+    "Respond with JSON only:\n"
+    "{\n"
+    '  "conflicts": boolean,\n'
+    '  "severity": "low" | "medium" | "high",\n'
+    '  "reason": "brief explanation"\n'
+    "}"
+)
+
+_MERGE_INSTRUCTIONS = (
+    "Suggest a merge strategy. Respond with JSON only:\n"
+    "{\n"
+    '  "strategy": "accept_both" | "accept_branch1" | "accept_branch2" | "manual" | "custom",\n'
+    '  "reasoning": "explanation",\n'
+    '  "merged_content": "full merged file content if strategy is accept_both or custom, otherwise null",\n'
+    '  "confidence": 0.0-1.0,\n'
+    '  "warnings": ["list of things to watch for"]\n'
+    "}"
+)
+
 
 class ConflictAnalyzer:
     """LLM-powered semantic conflict detection and merge suggestions."""
@@ -24,7 +53,7 @@ class ConflictAnalyzer:
             try:
                 import anthropic
 
-                self._client = anthropic.Anthropic(api_key=config.anthropic_api_key)
+                self._client = anthropic.AsyncAnthropic(api_key=config.anthropic_api_key)
             except Exception:
                 logger.warning("Failed to initialize Anthropic client")
         else:
@@ -44,20 +73,25 @@ class ConflictAnalyzer:
         if not self._client:
             return []
 
-        conflicts: list[dict[str, Any]] = []
+        recent_by_file = await asyncio.gather(
+            *(self.work_queue.get_recent_actions(f, hours=24) for f in files)
+        )
+        checks = [
+            (file_path, intent, action["intent"], action["agent_id"])
+            for file_path, recent in zip(files, recent_by_file)
+            for action in [a for a in recent if a["agent_id"] != agent_id][:3]
+        ]
+        if not checks:
+            return []
 
-        for file_path in files:
-            recent = await self.work_queue.get_recent_actions(file_path, hours=24)
-            other_actions = [a for a in recent if a["agent_id"] != agent_id]
+        semaphore = asyncio.Semaphore(_MAX_CONCURRENT_CHECKS)
 
-            for action in other_actions[:3]:
-                conflict = await self._check_action_conflict(
-                    file_path, intent, action["intent"], action["agent_id"]
-                )
-                if conflict:
-                    conflicts.append(conflict)
+        async def bounded_check(check: tuple[str, str, str, str]) -> dict[str, Any] | None:
+            async with semaphore:
+                return await self._check_action_conflict(*check)
 
-        return conflicts
+        results = await asyncio.gather(*(bounded_check(check) for check in checks))
+        return [conflict for conflict in results if conflict]
 
     async def generate_merge_suggestion(
         self,
@@ -76,24 +110,16 @@ class ConflictAnalyzer:
 
         prompt = (
             f"Analyze a potential merge conflict in {file_path} between "
-            f"branch '{branch1}' and branch '{branch2}'.\n\n"
-            "Suggest a merge strategy. Respond with JSON only:\n"
-            "{\n"
-            '  "strategy": "accept_both" | "accept_branch1" | "accept_branch2" | "manual" | "custom",\n'
-            '  "reasoning": "explanation",\n'
-            '  "merged_content": "full merged file content if strategy is accept_both or custom, otherwise null",\n'
-            '  "confidence": 0.0-1.0,\n'
-            '  "warnings": ["list of things to watch for"]\n'
-            "}"
+            f"branch '{branch1}' and branch '{branch2}'.\n\n{_MERGE_INSTRUCTIONS}"
         )
 
         try:
-            response = self._client.messages.create(
+            response = await self._client.messages.create(
                 model=self._model,
                 max_tokens=4000,
                 messages=[{"role": "user", "content": prompt}],
             )
-            suggestion = json.loads(response.content[0].text)
+            suggestion = jsonio.loads(response.content[0].text)
             logger.info(
                 "Merge suggestion for %s: %s (confidence=%.2f)",
                 file_path,
@@ -124,26 +150,16 @@ class ConflictAnalyzer:
         prompt = (
             f"Analyze if these two code changes to {file_path} conflict semantically.\n\n"
             f"Change 1 Intent: {intent1}\n\n"
-            f"Change 2 Intent: {intent2}\n\n"
-            "Do these changes conflict? Consider:\n"
-            "- Are they modifying the same functionality?\n"
-            "- Could they introduce logical contradictions?\n"
-            "- Would both changes be compatible?\n\n"
-            "Respond with JSON only:\n"
-            "{\n"
-            '  "conflicts": boolean,\n'
-            '  "severity": "low" | "medium" | "high",\n'
-            '  "reason": "brief explanation"\n'
-            "}"
+            f"Change 2 Intent: {intent2}\n\n{_CONFLICT_CHECK_INSTRUCTIONS}"
         )
 
         try:
-            response = self._client.messages.create(
+            response = await self._client.messages.create(
                 model=self._model,
                 max_tokens=300,
                 messages=[{"role": "user", "content": prompt}],
             )
-            result = json.loads(response.content[0].text)
+            result = jsonio.loads(response.content[0].text)
 
             if result.get("conflicts"):
                 await self.db.create_conflict(
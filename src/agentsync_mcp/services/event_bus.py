@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import asyncio
+import itertools
 import logging
+from collections.abc import Callable, Coroutine
 from datetime import datetime
-from typing import Any, Callable, Coroutine
+from typing import Any
 
 logger = logging.getLogger(__name__)
 
@@ -18,33 +20,39 @@ class EventBus:
     """
 
     def __init__(self) -> None:
-        self._listeners: dict[str, list[Listener]] = {}
+        self._listeners: dict[str, set[Listener]] = {}
+        # Snapshot of the "*" listeners, rebuilt on change so publish does not copy it.
+        self._wildcard: tuple[Listener, ...] = ()
 
     def subscribe(self, event_type: str, listener: Listener) -> None:
-        self._listeners.setdefault(event_type, []).append(listener)
+        self._listeners.setdefault(event_type, set()).add(listener)
+        if event_type == "*":
+            self._wildcard = tuple(self._listeners["*"])
 
     def unsubscribe(self, event_type: str, listener: Listener) -> None:
-        listeners = self._listeners.get(event_type, [])
-        if listener in listeners:
-            listeners.remove(listener)
+        listeners = self._listeners.get(event_type)
+        if listeners is None:
+            return
+        listeners.discard(listener)
+        if not listeners:
+            del self._listeners[event_type]
+        if event_type == "*":
+            self._wildcard = tuple(listeners)
 
     async def publish(self, event_type: str, data: dict[str, Any]) -> None:
         """Fire an event to all matching listeners."""
+        listeners = () if event_type == "*" else self._listeners.get(event_type, ())
+        if not listeners and not self._wildcard:
+            return
+
         event = {
             "type": event_type,
             "timestamp": datetime.now().isoformat(),
             **data,
         }
 
-        targets: list[Listener] = []
-        targets.extend(self._listeners.get(event_type, []))
-        targets.extend(self._listeners.get("*", []))
-
-        if not targets:
-            return
-
         results = await asyncio.gather(
-            *(listener(event) for listener in targets),
+            *(listener(event) for listener in itertools.chain(listeners, self._wildcard)),
             return_exceptions=True,
         )
         for i, result in enumerate(results):
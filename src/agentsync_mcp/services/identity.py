@@ -5,9 +5,28 @@ import re
 import socket
 import subprocess
 import uuid
-from dataclasses import dataclass, field
+from collections.abc import Mapping
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Mapping
+from types import MappingProxyType
+from typing import Any
+
+_SLUG_RE = re.compile(r"[^a-zA-Z0-9_-]+")
+
+# Case-insensitive match for the env prefixes recorded as session markers.
+_ENV_MARKER_RE = re.compile(r"(?:CLAUDE|CODEX|CURSOR|AIDER|AGENTSYNC)_", re.IGNORECASE)
+_ENV_MARKER_KEYWORDS = ("cursor", "aider")
+
+_DISPLAY_NAMES: Mapping[str, str] = MappingProxyType(
+    {
+        "claude": "Claude",
+        "codex": "Codex",
+        "cursor": "Cursor",
+        "aider": "Aider",
+        "unknown": "Unknown Agent",
+    }
+)
 
 
 def generate_agent_id() -> str:
@@ -39,7 +58,8 @@ class AgentSessionIdentity:
     repo_name: str | None
     git_branch: str | None
     transport: str = "stdio"
-    metadata: dict[str, Any] = field(default_factory=dict)
+    # Read-only with tuple values: detected identities are memoized and shared.
+    metadata: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
 
     def to_agent_record(self) -> dict[str, Any]:
         return {
@@ -54,7 +74,10 @@ class AgentSessionIdentity:
             "repo_name": self.repo_name,
             "git_branch": self.git_branch,
             "transport": self.transport,
-            "metadata": self.metadata,
+            "metadata": {
+                key: list(value) if isinstance(value, tuple) else value
+                for key, value in self.metadata.items()
+            },
         }
 
     def to_public_dict(self) -> dict[str, Any]:
@@ -62,21 +85,55 @@ class AgentSessionIdentity:
 
 
 def detect_agent_session_identity(env: Mapping[str, str] | None = None) -> AgentSessionIdentity:
-    """Best-effort zero-config detection of the connected agent session."""
+    """Best-effort zero-config detection of the connected agent session.
+
+    Detection is memoized on the environment variables it reads, the
+    working directory, the parent pid, the pid and the git repo info, which
+    is looked up on every call so branch switches are seen. Without
+    ``AGENTSYNC_AGENT_ID`` every call still gets a fresh random agent ID.
+    """
     env = env or os.environ
+    repo_root, git_branch = _git_repo_info()
+    ident = _detect_cached(
+        _env_fingerprint(env), os.getcwd(), os.getppid(), os.getpid(), repo_root, git_branch
+    )
+    if ident.agent_id:
+        return ident
+    short_id = uuid.uuid4().hex[:6]
+    return replace(ident, agent_id=f"{ident.agent_type}-{ident.host}-{ident.pid}-{short_id}")
+
+
+def _env_fingerprint(env: Mapping[str, str]) -> frozenset[tuple[str, str]]:
+    """Return the subset of ``env`` that identity detection depends on."""
+    return frozenset(
+        (key, value)
+        for key, value in env.items()
+        if _ENV_MARKER_RE.match(key)
+        or any(keyword in key.lower() for keyword in _ENV_MARKER_KEYWORDS)
+    )
+
+
+@lru_cache(maxsize=16)
+def _detect_cached(
+    fingerprint: frozenset[tuple[str, str]],
+    cwd: str,
+    ppid: int,
+    pid: int,
+    repo_root: str | None,
+    git_branch: str | None,
+) -> AgentSessionIdentity:
+    """Detect everything but the random agent ID, which is left empty if not set in env."""
+    env = dict(fingerprint)
     host = _safe_slug(socket.gethostname().split(".")[0][:24]) or "host"
-    pid = os.getpid()
-    ppid = os.getppid()
 
-    cwd_path = Path.cwd()
-    repo_root = _git("rev-parse", "--show-toplevel")
-    git_branch = _git("rev-parse", "--abbrev-ref", "HEAD")
+    cwd_path = Path(cwd)
     repo_name = Path(repo_root).name if repo_root else cwd_path.name
 
     env_type = env.get("AGENTSYNC_AGENT_TYPE")
     env_client_name = env.get("AGENTSYNC_CLIENT_NAME")
+    env_buckets = _bucket_env_keys(env)
     process_markers = _get_process_markers(ppid)
-    detected_type, detected_name, detected_from = _detect_client(env, process_markers)
+    detected_type, detected_name, detected_from = _detect_client(env_buckets, process_markers)
 
     agent_type = _normalize_agent_type(env_type or detected_type)
     client_name = env_client_name or detected_name or _display_name_for(agent_type)
@@ -90,27 +147,22 @@ def detect_agent_session_identity(env: Mapping[str, str] | None = None) -> Agent
     )
     branch_hint = None if git_branch in (None, "HEAD") else git_branch
     default_label = "-".join(
-        part
-        for part in [client_name, repo_name, branch_hint, str(pid)]
-        if part
+        part for part in [client_name, repo_name, branch_hint, str(pid)] if part
     )
     session_label = session_hint or default_label
 
-    agent_id = env.get("AGENTSYNC_AGENT_ID")
-    if not agent_id:
-        short_id = uuid.uuid4().hex[:6]
-        agent_id = f"{agent_type}-{host}-{pid}-{short_id}"
-
-    metadata = {
-        "ppid": ppid,
-        "detected_from": detected_from,
-        "process_markers": process_markers,
-        "env_markers": _interesting_env_markers(env),
-        "repo_root_source": "git" if repo_root else "cwd",
-    }
+    metadata = MappingProxyType(
+        {
+            "ppid": ppid,
+            "detected_from": detected_from,
+            "process_markers": tuple(process_markers),
+            "env_markers": tuple(_interesting_env_markers(env_buckets)),
+            "repo_root_source": "git" if repo_root else "cwd",
+        }
+    )
 
     return AgentSessionIdentity(
-        agent_id=agent_id,
+        agent_id=env.get("AGENTSYNC_AGENT_ID", ""),
         agent_type=agent_type,
         client_name=client_name,
         session_label=session_label,
@@ -141,16 +193,34 @@ def _git(*args: str) -> str | None:
     return value or None
 
 
+def _git_repo_info() -> tuple[str | None, str | None]:
+    """Return ``(repo_root, branch)`` from a single ``git rev-parse`` call."""
+    output = _git("rev-parse", "--show-toplevel", "--abbrev-ref", "HEAD")
+    if output is None:
+        # HEAD does not resolve in a repo without commits; the root still does.
+        return _git("rev-parse", "--show-toplevel"), None
+    lines = output.splitlines()
+    if len(lines) != 2:
+        return None, None
+    return lines[0] or None, lines[1] or None
+
+
 def _get_process_markers(ppid: int) -> list[str]:
     markers: list[str] = []
+    ps_table: dict[int, tuple[str | None, str | None]] | None = None
     current = ppid
     for _ in range(4):
         if current <= 1:
             break
-        command = _ps_value(current, "command")
+        proc_info = _read_proc(current)
+        if proc_info is None:
+            # No /proc: snapshot the process table once and walk it in memory.
+            if ps_table is None:
+                ps_table = _ps_table()
+            proc_info = ps_table.get(current, (None, None))
+        command, parent = proc_info
         if command:
             markers.append(command)
-        parent = _ps_value(current, "ppid")
         if not parent:
             break
         try:
@@ -163,29 +233,82 @@ def _get_process_markers(ppid: int) -> list[str]:
     return markers
 
 
-def _ps_value(pid: int, field: str) -> str | None:
+def _read_proc(pid: int) -> tuple[str | None, str | None] | None:
+    """Return ``(command, ppid)`` from /proc, or None where /proc is unavailable."""
+    proc_dir = Path("/proc") / str(pid)
+    try:
+        cmdline = (proc_dir / "cmdline").read_bytes()
+        stat = (proc_dir / "stat").read_text()
+    except OSError:
+        return None
+    command = " ".join(os.fsdecode(arg) for arg in cmdline.split(b"\0") if arg) or None
+    # The comm field is parenthesised and may contain spaces; ppid is the
+    # second field after it.
+    fields = stat.rpartition(")")[2].split()
+    parent = fields[1] if len(fields) > 1 else None
+    return command, parent
+
+
+def _ps_table() -> dict[int, tuple[str | None, str | None]]:
+    """Return ``{pid: (command, ppid)}`` for every process from a single ``ps`` call."""
     try:
         proc = subprocess.run(
-            ["ps", "-o", f"{field}=", "-p", str(pid)],
+            ["ps", "-A", "-ww", "-o", "pid=,ppid=,command="],
             capture_output=True,
             text=True,
             timeout=0.5,
             check=False,
         )
     except Exception:
-        return None
+        return {}
     if proc.returncode != 0:
-        return None
-    value = proc.stdout.strip()
-    return value or None
-
-
-def _detect_client(env: Mapping[str, str], process_markers: list[str]) -> tuple[str, str, str]:
+        return {}
+    table: dict[int, tuple[str | None, str | None]] = {}
+    for line in proc.stdout.splitlines():
+        parts = line.split(None, 2)
+        if len(parts) < 2:
+            continue
+        try:
+            pid = int(parts[0])
+        except ValueError:
+            continue
+        command = parts[2].strip() if len(parts) == 3 else None
+        table[pid] = (command or None, parts[1])
+    return table
+
+
+def _bucket_env_keys(env: Mapping[str, str]) -> dict[str, list[str]]:
+    """Group the env keys each client check looks at in a single pass."""
+    buckets: dict[str, list[str]] = {
+        "codex": [],
+        "claude": [],
+        "cursor": [],
+        "aider": [],
+        "markers": [],
+    }
+    for key in env:
+        if key.startswith("CODEX_"):
+            buckets["codex"].append(key)
+        elif key.startswith("CLAUDE_"):
+            buckets["claude"].append(key)
+        lower = key.lower()
+        if "cursor" in lower:
+            buckets["cursor"].append(key)
+        if "aider" in lower:
+            buckets["aider"].append(key)
+        if _ENV_MARKER_RE.match(key):
+            buckets["markers"].append(key)
+    return buckets
+
+
+def _detect_client(
+    env_buckets: Mapping[str, list[str]], process_markers: list[str]
+) -> tuple[str, str, str]:
     checks = [
-        ("codex", "Codex", _matches_codex(env, process_markers)),
-        ("claude", "Claude", _matches_claude(env, process_markers)),
-        ("cursor", "Cursor", _matches_keyword(env, process_markers, "cursor")),
-        ("aider", "Aider", _matches_keyword(env, process_markers, "aider")),
+        ("codex", "Codex", _matches_codex(env_buckets, process_markers)),
+        ("claude", "Claude", _matches_claude(env_buckets, process_markers)),
+        ("cursor", "Cursor", _matches_keyword(env_buckets, process_markers, "cursor")),
+        ("aider", "Aider", _matches_keyword(env_buckets, process_markers, "aider")),
     ]
     for agent_type, display, detected_from in checks:
         if detected_from:
@@ -193,16 +316,16 @@ def _detect_client(env: Mapping[str, str], process_markers: list[str]) -> tuple[
     return "unknown", "Unknown Agent", "fallback"
 
 
-def _matches_codex(env: Mapping[str, str], process_markers: list[str]) -> str | None:
-    if any(key.startswith("CODEX_") for key in env):
+def _matches_codex(env_buckets: Mapping[str, list[str]], process_markers: list[str]) -> str | None:
+    if env_buckets["codex"]:
         return "env:CODEX_*"
     if any("codex" in marker.lower() for marker in process_markers):
         return "process:codex"
     return None
 
 
-def _matches_claude(env: Mapping[str, str], process_markers: list[str]) -> str | None:
-    if any(key.startswith("CLAUDE_") for key in env):
+def _matches_claude(env_buckets: Mapping[str, list[str]], process_markers: list[str]) -> str | None:
+    if env_buckets["claude"]:
         return "env:CLAUDE_*"
     if any("claude" in marker.lower() for marker in process_markers):
         return "process:claude"
@@ -210,22 +333,17 @@ def _matches_claude(env: Mapping[str, str], process_markers: list[str]) -> str |
 
 
 def _matches_keyword(
-    env: Mapping[str, str], process_markers: list[str], keyword: str
+    env_buckets: Mapping[str, list[str]], process_markers: list[str], keyword: str
 ) -> str | None:
-    if any(keyword in key.lower() for key in env):
+    if env_buckets[keyword]:
         return f"env:*{keyword}*"
     if any(keyword in marker.lower() for marker in process_markers):
         return f"process:{keyword}"
     return None
 
 
-def _interesting_env_markers(env: Mapping[str, str]) -> list[str]:
-    markers: list[str] = []
-    for key in sorted(env):
-        upper = key.upper()
-        if upper.startswith(("CLAUDE_", "CODEX_", "CURSOR_", "AIDER_", "AGENTSYNC_")):
-            markers.append(key)
-    return markers[:20]
+def _interesting_env_markers(env_buckets: Mapping[str, list[str]]) -> list[str]:
+    return sorted(env_buckets["markers"])[:20]
 
 
 def _normalize_agent_type(value: str | None) -> str:
@@ -236,16 +354,10 @@ def _normalize_agent_type(value: str | None) -> str:
 
 
 def _display_name_for(agent_type: str) -> str:
-    names = {
-        "claude": "Claude",
-        "codex": "Codex",
-        "cursor": "Cursor",
-        "aider": "Aider",
-        "unknown": "Unknown Agent",
-    }
-    return names.get(agent_type, agent_type.title())
+    return _DISPLAY_NAMES.get(agent_type, agent_type.title())
 
 
+@lru_cache(maxsize=256)
 def _safe_slug(value: str) -> str:
-    slug = re.sub(r"[^a-zA-Z0-9_-]+", "-", value).strip("-").lower()
+    slug = _SLUG_RE.sub("-", value).strip("-").lower()
     return slug[:48]
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
 import logging
+import time
+from collections import defaultdict
+from dataclasses import replace
 from datetime import datetime, timedelta
 from typing import Any
 
@@ -18,14 +22,31 @@ class LockManager:
     - SQLite (WAL mode) is the **source of truth** so multiple stdio
       server processes (one per agent) see each other's locks.
     - In-memory dict acts as a fast cache, refreshed from DB before
-      every acquire/check operation.
-    - asyncio.Lock serialises access within a single process.
-    - Background task periodically expires stale locks.
+      every acquire/release operation.
+    - asyncio.Lock serialises writers within a single process; read
+      paths load their own snapshot and never take it.
+    - Background task expires stale locks, waking at the next known
+      expiry (tracked in a min-heap) or every ``cleanup_interval``.
     """
 
     def __init__(self, db: Database, cleanup_interval: int = 60):
         self.db = db
         self._locks: dict[str, LockInfo] = {}
+        # Flat per-file columns mirroring ``_locks`` so expiry and owner
+        # scans compare plain floats/strings instead of walking LockInfo.
+        self._expires_at: dict[str, float] = {}
+        self._agent_by_file: dict[str, str] = {}
+        self._by_agent: defaultdict[str, set[str]] = defaultdict(set)
+        # (expires_at, file_path) min-heap; entries whose timestamp no longer
+        # matches ``_expires_at`` are stale and skipped when popped.
+        self._expiry_heap: list[tuple[float, str]] = []
+        # When the cleanup loop will next wake; only a lock expiring before
+        # that needs to wake it early.
+        self._cleanup_deadline = 0.0
+        self._next_expiry_changed = asyncio.Event()
+        # LockInfo objects from the last load keyed by their raw DB row, so
+        # unchanged locks skip timestamp parsing and keep their to_dict cache.
+        self._row_cache: dict[str, tuple[tuple[str, str, str, str], LockInfo]] = {}
         self._mu = asyncio.Lock()
         self._cleanup_interval = cleanup_interval
         self._cleanup_task: asyncio.Task[None] | None = None
@@ -69,43 +90,120 @@ class LockManager:
             # Refresh from DB to see locks from other processes
             await self._sync_from_db()
 
+            now_ts = time.time()
+            now = datetime.fromtimestamp(now_ts)
+            expires_at = now + timedelta(seconds=ttl_seconds)
             if file_path in self._locks:
                 existing = self._locks[file_path]
 
-                if existing.is_expired():
+                if now_ts >= existing.expires_ts:
                     logger.info("Lock on %s expired, removing", file_path)
-                    del self._locks[file_path]
+                    self._drop_lock(file_path)
                 elif existing.agent_id == agent_id:
-                    # Renew
-                    existing.expires_at = datetime.now() + timedelta(seconds=ttl_seconds)
-                    await self.db.update_lock_expiry(file_path, existing.expires_at)
+                    # Renew on a copy: ``existing`` is shared with the row
+                    # cache and must stay untouched if the write fails.
+                    renewed = replace(existing, expires_at=expires_at)
+                    await self.db.update_lock_expiry(file_path, expires_at)
+                    self._put_lock(renewed)
                     logger.info("Renewed lock on %s for %s", file_path, agent_id)
                     return {"success": True}
                 else:
                     logger.warning("Lock denied on %s: held by %s", file_path, existing.agent_id)
-                    return {
-                        "success": False,
-                        "locked_by": existing.agent_id,
-                        "locked_at": existing.locked_at.isoformat(),
-                        "description": existing.description,
-                        "expires_at": existing.expires_at.isoformat(),
-                    }
+                    return _denied(existing)
 
             lock_info = LockInfo(
                 file_path=file_path,
                 agent_id=agent_id,
                 description=description,
-                locked_at=datetime.now(),
-                expires_at=datetime.now() + timedelta(seconds=ttl_seconds),
-            )
-            self._locks[file_path] = lock_info
-            await self.db.create_lock(lock_info)
-            await self.db.log_event(
-                "lock_acquired", agent_id, {"file": file_path, "description": description}
+                locked_at=now,
+                expires_at=expires_at,
             )
+            await self.db.create_locks_bulk([lock_info])
+            self._put_lock(lock_info)
             logger.info("Lock acquired on %s by %s", file_path, agent_id)
             return {"success": True}
 
+    async def acquire_locks(
+        self,
+        file_paths: list[str],
+        agent_id: str,
+        description: str,
+        ttl_seconds: int = 1800,
+        *,
+        atomic: bool = False,
+    ) -> dict[str, dict[str, Any]]:
+        """Attempt to acquire locks on several files at once.
+
+        Same semantics as :meth:`acquire_lock` per file, but every file is
+        classified in memory first and all new locks and renewals are then
+        written in a single DB transaction. With ``atomic=True`` nothing is
+        acquired or renewed if any file is held by another agent; those
+        other files get ``{"success": False, "skipped": True}``. Returns a
+        mapping of file path to the per-file result dict.
+        """
+        results: dict[str, dict[str, Any]] = {}
+        async with self._mu:
+            await self._sync_from_db()
+
+            now_ts = time.time()
+            free: list[str] = []
+            owned: list[LockInfo] = []
+            for file_path in dict.fromkeys(file_paths):
+                existing = self._locks.get(file_path)
+                if existing is not None and now_ts >= existing.expires_ts:
+                    logger.info("Lock on %s expired, removing", file_path)
+                    self._drop_lock(file_path)
+                    existing = None
+
+                if existing is None:
+                    free.append(file_path)
+                elif existing.agent_id == agent_id:
+                    owned.append(existing)
+                else:
+                    logger.warning("Lock denied on %s: held by %s", file_path, existing.agent_id)
+                    results[file_path] = _denied(existing)
+
+            if atomic and results:
+                for file_path in free:
+                    results[file_path] = {"success": False, "skipped": True}
+                for lock_info in owned:
+                    results[lock_info.file_path] = {"success": False, "skipped": True}
+                return results
+
+            now = datetime.fromtimestamp(now_ts)
+            expires_at = now + timedelta(seconds=ttl_seconds)
+            new_locks = [
+                LockInfo(
+                    file_path=file_path,
+                    agent_id=agent_id,
+                    description=description,
+                    locked_at=now,
+                    expires_at=expires_at,
+                )
+                for file_path in free
+            ]
+            # Renew on copies and touch memory only once the write lands, so a
+            # failed transaction leaves the cache matching the DB.
+            renewed = [replace(lock_info, expires_at=expires_at) for lock_info in owned]
+            await self.db.create_locks_bulk(new_locks, renewed=renewed)
+            for lock_info in (*new_locks, *renewed):
+                self._put_lock(lock_info)
+                results[lock_info.file_path] = {"success": True}
+
+            if owned:
+                logger.info(
+                    "Renewed locks on %s for %s",
+                    ", ".join(lock.file_path for lock in owned),
+                    agent_id,
+                )
+            if new_locks:
+                logger.info(
+                    "Locks acquired on %s by %s",
+                    ", ".join(lock.file_path for lock in new_locks),
+                    agent_id,
+                )
+        return results
+
     async def release_lock(self, file_path: str, agent_id: str) -> bool:
         """Release a lock. Only the owner can release."""
         async with self._mu:
@@ -123,54 +221,47 @@ class LockManager:
                 )
                 return False
 
-            del self._locks[file_path]
-            await self.db.release_lock(file_path, agent_id)
-            await self.db.log_event("lock_released", agent_id, {"file": file_path})
+            self._drop_lock(file_path)
+            await self.db.release_lock(file_path, agent_id, with_event=True)
             logger.info("Lock released on %s by %s", file_path, agent_id)
             return True
 
+    # Read paths load their own snapshot from the DB and never touch
+    # ``self._locks``, so they do not wait on ``_mu`` behind writers.
+
     async def get_lock_info(self, file_path: str) -> dict[str, Any] | None:
-        async with self._mu:
-            await self._sync_from_db()
-            lock_info = self._locks.get(file_path)
-            if lock_info is None:
-                return None
-            if lock_info.is_expired():
-                del self._locks[file_path]
-                return None
-            return lock_info.model_dump(mode="json")
+        lock_info = (await self._load_locks()).get(file_path)
+        return lock_info.to_dict() if lock_info else None
+
+    async def get_lock_infos(self, file_paths: list[str]) -> dict[str, dict[str, Any] | None]:
+        """Look up several files from one snapshot; unlocked files map to None."""
+        locks = await self._load_locks()
+        infos: dict[str, dict[str, Any] | None] = {}
+        for file_path in file_paths:
+            lock_info = locks.get(file_path)
+            infos[file_path] = lock_info.to_dict() if lock_info else None
+        return infos
 
     async def get_all_locks(self) -> list[dict[str, Any]]:
-        async with self._mu:
-            await self._sync_from_db()
-            self._purge_expired()
-            return [lock.model_dump(mode="json") for lock in self._locks.values()]
+        locks = await self._load_locks()
+        return [lock.to_dict() for lock in locks.values()]
 
     async def get_locks_by_agent(self, agent_id: str) -> list[dict[str, Any]]:
-        async with self._mu:
-            await self._sync_from_db()
-            self._purge_expired()
-            return [
-                lock.model_dump(mode="json")
-                for lock in self._locks.values()
-                if lock.agent_id == agent_id
-            ]
+        locks = await self._load_locks()
+        return [lock.to_dict() for lock in locks.values() if lock.agent_id == agent_id]
 
     async def release_all_agent_locks(self, agent_id: str) -> int:
         async with self._mu:
             await self._sync_from_db()
-            to_release = [fp for fp, lk in self._locks.items() if lk.agent_id == agent_id]
+            to_release = sorted(self._by_agent.get(agent_id, ()))
             for fp in to_release:
-                del self._locks[fp]
-                await self.db.release_lock(fp, agent_id)
+                self._drop_lock(fp)
+            await self.db.release_locks(to_release, agent_id)
             logger.info("Released %d locks for agent %s", len(to_release), agent_id)
             return len(to_release)
 
     async def get_active_lock_count(self) -> int:
-        async with self._mu:
-            await self._sync_from_db()
-            self._purge_expired()
-            return len(self._locks)
+        return len(await self._load_locks())
 
     # ------------------------------------------------------------------
     # Internal helpers
@@ -178,9 +269,42 @@ class LockManager:
 
     def _purge_expired(self) -> None:
         """Remove expired locks from in-memory state (caller must hold _mu)."""
-        expired = [fp for fp, lk in self._locks.items() if lk.is_expired()]
-        for fp in expired:
-            del self._locks[fp]
+        now = time.time()
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, fp = heapq.heappop(heap)
+            if self._expires_at.get(fp) == expires_at:
+                self._drop_lock(fp)
+
+    def _put_lock(self, lock_info: LockInfo) -> None:
+        """Add or refresh a lock in the cache and its columns (caller must hold _mu)."""
+        file_path = lock_info.file_path
+        previous_owner = self._agent_by_file.get(file_path)
+        if previous_owner is not None and previous_owner != lock_info.agent_id:
+            self._unindex_owner(previous_owner, file_path)
+        expires_at = lock_info.expires_ts
+        self._locks[file_path] = lock_info
+        self._expires_at[file_path] = expires_at
+        heapq.heappush(self._expiry_heap, (expires_at, file_path))
+        if expires_at < self._cleanup_deadline:
+            self._next_expiry_changed.set()
+        self._agent_by_file[file_path] = lock_info.agent_id
+        self._by_agent[lock_info.agent_id].add(file_path)
+
+    def _drop_lock(self, file_path: str) -> None:
+        """Remove a lock from the cache and its columns (caller must hold _mu)."""
+        self._locks.pop(file_path, None)
+        self._expires_at.pop(file_path, None)
+        owner = self._agent_by_file.pop(file_path, None)
+        if owner is not None:
+            self._unindex_owner(owner, file_path)
+
+    def _unindex_owner(self, agent_id: str, file_path: str) -> None:
+        paths = self._by_agent.get(agent_id)
+        if paths is not None:
+            paths.discard(file_path)
+            if not paths:
+                del self._by_agent[agent_id]
 
     async def _sync_from_db(self) -> None:
         """Rebuild in-memory cache from the DB (caller must hold _mu).
@@ -188,26 +312,79 @@ class LockManager:
         This is the key to multi-process coordination: each stdio server
         process reads the shared SQLite DB to see all active locks.
         """
+        locks = await self._load_locks()
+        self._locks = {}
+        self._expires_at = {}
+        self._agent_by_file = {}
+        self._by_agent = defaultdict(set)
+        self._expiry_heap = []
+        for lock_info in locks.values():
+            self._put_lock(lock_info)
+
+    async def _load_locks(self) -> dict[str, LockInfo]:
+        """Return a fresh dict of the unexpired locks recorded in the DB."""
         rows = await self.db.get_active_locks()
-        now = datetime.now()
-        self._locks.clear()
+        now = time.time()
+        locks: dict[str, LockInfo] = {}
+        row_cache: dict[str, tuple[tuple[str, str, str, str], LockInfo]] = {}
         for row in rows:
-            expires_at = datetime.fromisoformat(row["expires_at"])
-            if expires_at > now:
-                self._locks[row["file_path"]] = LockInfo(
-                    file_path=row["file_path"],
-                    agent_id=row["agent_id"],
-                    description=row["description"] or "",
-                    locked_at=datetime.fromisoformat(row["locked_at"]),
-                    expires_at=expires_at,
+            file_path = row["file_path"]
+            key = (row["agent_id"], row["description"] or "", row["locked_at"], row["expires_at"])
+            cached = self._row_cache.get(file_path)
+            if cached is not None and cached[0] == key:
+                lock_info = cached[1]
+            else:
+                lock_info = LockInfo(
+                    file_path=file_path,
+                    agent_id=key[0],
+                    description=key[1],
+                    locked_at=datetime.fromisoformat(key[2]),
+                    expires_at=datetime.fromisoformat(key[3]),
                 )
+            row_cache[file_path] = (key, lock_info)
+            if lock_info.expires_ts > now:
+                locks[file_path] = lock_info
+        self._row_cache = row_cache
+        return locks
 
     async def _cleanup_loop(self) -> None:
-        """Periodically clean up expired locks in memory and DB."""
+        """Clean up expired locks in memory and DB as they come due.
+
+        Sleeps until the earliest cached expiry, capped at
+        ``cleanup_interval`` so locks written by other processes (and
+        newer, shorter locks) are still swept from the DB. A lock expiring
+        before the armed wake-up wakes the loop to re-arm its timer, and the
+        in-memory purge only takes ``_mu`` when something is due.
+        """
         while True:
-            await asyncio.sleep(self._cleanup_interval)
-            async with self._mu:
-                self._purge_expired()
+            now = time.time()
+            delay = self._cleanup_interval
+            if self._expiry_heap:
+                delay = min(delay, max(0.0, self._expiry_heap[0][0] - now))
+            self._cleanup_deadline = now + delay
+            self._next_expiry_changed.clear()
+            changed = asyncio.ensure_future(self._next_expiry_changed.wait())
+            try:
+                await asyncio.wait({changed}, timeout=delay)
+            finally:
+                changed.cancel()
+            if self._next_expiry_changed.is_set():
+                continue
+            if self._expiry_heap and self._expiry_heap[0][0] <= time.time():
+                async with self._mu:
+                    self._purge_expired()
             count = await self.db.cleanup_expired_locks()
             if count:
                 logger.info("Cleaned up %d expired locks from DB", count)
+
+
+def _denied(existing: LockInfo) -> dict[str, Any]:
+    """Result for a lock held by another agent, reusing its cached serialisation."""
+    dump = existing.to_dict()
+    return {
+        "success": False,
+        "locked_by": dump["agent_id"],
+        "locked_at": dump["locked_at"],
+        "description": dump["description"],
+        "expires_at": dump["expires_at"],
+    }
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+
 from mcp.server.fastmcp import FastMCP
 
 from agentsync_mcp.db.database import Database
@@ -33,11 +35,14 @@ def register(
             files: Files affected by the action
             intent: Plain-English description of what the change accomplishes
         """
-        await db.touch_agent(agent_id)
-        await work_queue.register_action(agent_id, action, files, intent)
-
-        conflicts = await conflict_analyzer.detect_semantic_conflicts(
-            agent_id=agent_id, files=files, intent=intent
+        # The conflict check only looks at other agents' actions, so it does
+        # not need to wait for this one to be recorded.
+        _, _, conflicts = await asyncio.gather(
+            db.touch_agent(agent_id),
+            work_queue.register_action(agent_id, action, files, intent),
+            conflict_analyzer.detect_semantic_conflicts(
+                agent_id=agent_id, files=files, intent=intent
+            ),
         )
 
         return {"recorded": True, "conflicts": conflicts}
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+
 from mcp.server.fastmcp import FastMCP
 
 from agentsync_mcp.db.database import Database
@@ -18,8 +20,7 @@ def register(
 ) -> None:
     """Register lock-related MCP tools."""
 
-    async def _session_summary(for_agent_id: str) -> dict | None:
-        row = await db.get_agent(for_agent_id)
+    def _summarize_session(row: dict | None) -> dict | None:
         if not row:
             return None
         return {
@@ -39,6 +40,7 @@ def register(
         files: list[str],
         description: str,
         ttl_seconds: int = 1800,
+        atomic: bool = True,
     ) -> dict:
         """Request exclusive locks on one or more files before editing them.
 
@@ -50,27 +52,39 @@ def register(
             files: File paths to lock, relative to the repo root (e.g. ["src/auth.py"])
             description: Brief description of your planned work
             ttl_seconds: Lock timeout in seconds (default 1800 = 30 min)
+            atomic: If any file is blocked, lock none of them (default True).
+                Set False to keep the locks on the files that were free.
+
+        Every requested file appears in exactly one of ``locked``, ``blocked``
+        (held by another agent) or ``not_locked`` (free, but left unlocked
+        because an atomic request was blocked; safe to retry).
         """
-        await db.touch_agent(agent_id)
+        _, results = await asyncio.gather(
+            db.touch_agent(agent_id),
+            lock_manager.acquire_locks(
+                files, agent_id, description, ttl_seconds=ttl_seconds, atomic=atomic
+            ),
+        )
+
+        holders = await db.get_agents(
+            list({result["locked_by"] for result in results.values() if "locked_by" in result})
+        )
 
         locked: list[str] = []
+        not_locked: list[str] = []
         blocked: list[dict] = []
-
         for file_path in files:
-            result = await lock_manager.acquire_lock(
-                file_path=file_path,
-                agent_id=agent_id,
-                description=description,
-                ttl_seconds=ttl_seconds,
-            )
+            result = results[file_path]
             if result["success"]:
                 locked.append(file_path)
+            elif "locked_by" not in result:
+                not_locked.append(file_path)
             else:
                 blocked.append(
                     {
                         "file": file_path,
                         "locked_by": result["locked_by"],
-                        "locked_by_session": await _session_summary(result["locked_by"]),
+                        "locked_by_session": _summarize_session(holders.get(result["locked_by"])),
                         "locked_at": result["locked_at"],
                         "description": result["description"],
                         "expires_at": result["expires_at"],
@@ -84,7 +98,12 @@ def register(
                 {"agent_id": agent_id, "files": locked, "description": description},
             )
 
-        return {"success": len(blocked) == 0, "locked": locked, "blocked": blocked}
+        return {
+            "success": len(blocked) == 0,
+            "locked": locked,
+            "blocked": blocked,
+            "not_locked": not_locked,
+        }
 
     @mcp.tool()
     async def release_file_lock(
@@ -126,11 +145,14 @@ def register(
         Args:
             files: File paths to check
         """
-        await db.touch_agent(agent_id)
+        _, infos = await asyncio.gather(
+            db.touch_agent(agent_id), lock_manager.get_lock_infos(files)
+        )
+        holders = await db.get_agents(list({info["agent_id"] for info in infos.values() if info}))
         statuses: list[dict] = []
         for file_path in files:
-            info = await lock_manager.get_lock_info(file_path)
-            session = await _session_summary(info["agent_id"]) if info else None
+            info = infos[file_path]
+            session = _summarize_session(holders.get(info["agent_id"])) if info else None
             statuses.append(
                 {
                     "file": file_path,
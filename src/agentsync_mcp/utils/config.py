@@ -1,63 +1,82 @@
 from __future__ import annotations
 
+import functools
 import os
-from dataclasses import dataclass, field
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
 from dotenv import load_dotenv
 
-load_dotenv()
+# Deployments that pass configuration through the real environment can set
+# AGENTSYNC_SKIP_DOTENV=1 to skip searching for and parsing a .env file.
+if not os.environ.get("AGENTSYNC_SKIP_DOTENV"):
+    load_dotenv()
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Config:
-    """Central configuration loaded from environment variables."""
+    """Central configuration loaded from environment variables.
+
+    Field defaults apply when the matching variable is unset; build an
+    instance from the environment with :meth:`from_env`.
+    """
 
     # Database
-    db_path: Path = field(
-        default_factory=lambda: Path(
-            os.environ.get("AGENTSYNC_DB_PATH", "data/agentsync.db")
-        )
-    )
+    db_path: Path = Path("data/agentsync.db")
 
     # Server
-    host: str = field(default_factory=lambda: os.environ.get("AGENTSYNC_HOST", "0.0.0.0"))
-    port: int = field(default_factory=lambda: int(os.environ.get("AGENTSYNC_PORT", "8080")))
+    host: str = "0.0.0.0"
+    port: int = 8080
 
     # Lock defaults
-    default_ttl_seconds: int = field(
-        default_factory=lambda: int(os.environ.get("AGENTSYNC_DEFAULT_TTL", "1800"))
-    )
-    lock_cleanup_interval: int = field(
-        default_factory=lambda: int(os.environ.get("AGENTSYNC_CLEANUP_INTERVAL", "60"))
-    )
+    default_ttl_seconds: int = 1800
+    lock_cleanup_interval: int = 60
 
     # Session presence / autodetection
-    session_heartbeat_interval: int = field(
-        default_factory=lambda: int(
-            os.environ.get("AGENTSYNC_SESSION_HEARTBEAT_INTERVAL", "15")
-        )
-    )
-    session_stale_after_seconds: int = field(
-        default_factory=lambda: int(
-            os.environ.get("AGENTSYNC_SESSION_STALE_AFTER_SECONDS", "90")
-        )
-    )
+    session_heartbeat_interval: int = 15
+    session_stale_after_seconds: int = 90
 
     # LLM (for conflict analysis)
-    anthropic_api_key: str | None = field(
-        default_factory=lambda: os.environ.get("ANTHROPIC_API_KEY")
-    )
-    conflict_model: str = field(
-        default_factory=lambda: os.environ.get("AGENTSYNC_CONFLICT_MODEL", "claude-sonnet-4-20250514")
-    )
+    anthropic_api_key: str | None = None
+    conflict_model: str = "claude-sonnet-4-20250514"
 
     # Logging
-    log_level: str = field(
-        default_factory=lambda: os.environ.get("AGENTSYNC_LOG_LEVEL", "INFO")
-    )
+    log_level: str = "INFO"
+
+    @classmethod
+    def from_env(cls, env: Mapping[str, str] | None = None) -> Config:
+        """Build a Config from ``env`` (default ``os.environ``) in one pass."""
+        env = os.environ if env is None else env
+        overrides: dict[str, Any] = {}
+        for field_name, (var, parse) in _ENV_FIELDS.items():
+            value = env.get(var)
+            if value is not None:
+                overrides[field_name] = parse(value)
+        return cls(**overrides)
+
 
+# Config field -> (environment variable, parser for its string value).
+_ENV_FIELDS: dict[str, tuple[str, Callable[[str], Any]]] = {
+    "db_path": ("AGENTSYNC_DB_PATH", Path),
+    "host": ("AGENTSYNC_HOST", str),
+    "port": ("AGENTSYNC_PORT", int),
+    "default_ttl_seconds": ("AGENTSYNC_DEFAULT_TTL", int),
+    "lock_cleanup_interval": ("AGENTSYNC_CLEANUP_INTERVAL", int),
+    "session_heartbeat_interval": ("AGENTSYNC_SESSION_HEARTBEAT_INTERVAL", int),
+    "session_stale_after_seconds": ("AGENTSYNC_SESSION_STALE_AFTER_SECONDS", int),
+    "anthropic_api_key": ("ANTHROPIC_API_KEY", str),
+    "conflict_model": ("AGENTSYNC_CONFLICT_MODEL", str),
+    "log_level": ("AGENTSYNC_LOG_LEVEL", str),
+}
 
+
+@functools.lru_cache(maxsize=1)
 def get_config() -> Config:
-    """Return a Config instance (singleton-friendly via module caching)."""
-    return Config()
+    """Return the process-wide Config, read from the environment on first use.
+
+    ``Config`` is frozen, so every caller can share the one instance; call
+    ``get_config.cache_clear()`` to pick up environment changes.
+    """
+    return Config.from_env()
@@ -1,25 +1,121 @@
 from __future__ import annotations
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
+from typing import TextIO
+
+_FORMATTER = logging.Formatter(
+    "%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+
+_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+
+# Records the listener may hold before writing them even if more are queued.
+_MAX_BATCH_RECORDS = 256
+
+
+class _BatchingStreamHandler(logging.StreamHandler):  # type: ignore[type-arg]
+    """StreamHandler that collects formatted records and writes them on flush.
+
+    A burst of records then costs one ``write`` instead of one per record.
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        super().__init__(stream)
+        self._pending: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self._pending.append(self.format(record) + self.terminator)
+            if len(self._pending) >= _MAX_BATCH_RECORDS:
+                self.flush()
+        except RecursionError:  # as in logging.StreamHandler.emit
+            raise
+        except Exception:  # noqa: BLE001 - logging must never raise; handleError reports it
+            self.handleError(record)
+
+    def flush(self) -> None:
+        with self.lock:  # type: ignore[union-attr]
+            if self._pending:
+                try:
+                    self.stream.write("".join(self._pending))
+                finally:
+                    # Dropped on a failed write rather than retried forever.
+                    self._pending.clear()
+            super().flush()
+
+
+class _BatchingQueueListener(logging.handlers.QueueListener):
+    """Flushes its handlers once the queue has been drained."""
+
+    def handle(self, record: logging.LogRecord) -> None:
+        super().handle(record)
+        if self.queue.empty():
+            self.flush()
+
+    def stop(self) -> None:
+        super().stop()
+        self.flush()
+
+    def flush(self) -> None:
+        for handler in self.handlers:
+            handler.flush()
+
+
+# The handler installed by setup_logging, so repeat calls only adjust the
+# level instead of stacking handlers that each re-emit every record.
+_handler: logging.Handler | None = None
+_listener: logging.handlers.QueueListener | None = None
 
 
 def setup_logging(level: str = "INFO") -> None:
-    """Configure root logging for the AgentSync server."""
-    numeric_level = getattr(logging, level.upper(), logging.INFO)
+    """Configure root logging for the AgentSync server (safe to call again).
 
-    handler = logging.StreamHandler(sys.stderr)
-    handler.setFormatter(
-        logging.Formatter(
-            "%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
-        )
-    )
+    Records are handed to a queue and written to stderr by a listener
+    thread, so logging from the event loop never blocks on the write; a
+    burst of records is written in one go once the queue is drained.
+    """
+    global _handler, _listener
 
     root = logging.getLogger("agentsync_mcp")
-    root.setLevel(numeric_level)
-    root.addHandler(handler)
+    root.setLevel(_LEVELS.get(level.upper(), logging.INFO))
+    if _handler is not None:
+        return
+
+    stream_handler = _BatchingStreamHandler(sys.stderr)
+    stream_handler.setFormatter(_FORMATTER)
+
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    _listener = _BatchingQueueListener(records, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.unregister(stop_logging)
+    atexit.register(stop_logging)
+
+    _handler = logging.handlers.QueueHandler(records)
+    root.addHandler(_handler)
 
     # Suppress noisy third-party loggers
     logging.getLogger("aiosqlite").setLevel(logging.WARNING)
     logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+def stop_logging() -> None:
+    """Write out queued records and remove the handler installed by setup_logging."""
+    global _handler, _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _handler is not None:
+        logging.getLogger("agentsync_mcp").removeHandler(_handler)
+        _handler = None
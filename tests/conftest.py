@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import shutil
+from collections.abc import AsyncIterator
 from pathlib import Path
 
 import pytest
@@ -9,21 +11,43 @@ from agentsync_mcp.services.conflict_analyzer import ConflictAnalyzer
 from agentsync_mcp.services.event_bus import EventBus
 from agentsync_mcp.services.lock_manager import LockManager
 from agentsync_mcp.services.work_queue import WorkQueue
-from agentsync_mcp.utils.config import Config
+from agentsync_mcp.utils.config import Config, get_config
+
+
+@pytest.fixture(scope="session")
+async def db_template(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """A database file with the schema applied once for the whole session.
+
+    File-backed ``db`` fixtures start from a copy, so tests stay isolated
+    while ``initialize()`` finds the schema current and skips applying it.
+    """
+    path = tmp_path_factory.mktemp("template") / "template.db"
+    database = Database(path)
+    await database.initialize()
+    await database.close()
+    return path
 
 
 @pytest.fixture
-async def db(tmp_path: Path) -> Database:
-    database = Database(tmp_path / "test.db")
+async def db(
+    request: pytest.FixtureRequest, tmp_path: Path, db_template: Path
+) -> AsyncIterator[Database]:
+    """In-memory database, or a file copy of the template for ``file_db`` tests."""
+    if request.node.get_closest_marker("file_db"):
+        shutil.copyfile(db_template, tmp_path / "test.db")
+        database = Database(tmp_path / "test.db")
+    else:
+        database = Database(":memory:")
     await database.initialize()
-    return database
+    yield database
+    await database.close()
 
 
 @pytest.fixture
-async def lock_manager(db: Database) -> LockManager:
+async def lock_manager(db: Database) -> AsyncIterator[LockManager]:
     lm = LockManager(db, cleanup_interval=3600)  # long interval so it won't fire in tests
     await lm.start()
-    yield lm  # type: ignore[misc]
+    yield lm
     await lm.stop()
 
 
@@ -37,9 +61,9 @@ def event_bus() -> EventBus:
     return EventBus()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def config() -> Config:
-    return Config()
+    return get_config()
 
 
 @pytest.fixture
@@ -6,18 +6,26 @@ lock → work → release.
 
 from __future__ import annotations
 
+import asyncio
+import json
+import shutil
+from collections.abc import AsyncIterator
 from pathlib import Path
 
 import pytest
+from mcp.server.fastmcp import FastMCP
 
 from agentsync_mcp.db.database import Database
 from agentsync_mcp.services.event_bus import EventBus
 from agentsync_mcp.services.lock_manager import LockManager
 from agentsync_mcp.services.work_queue import WorkQueue
+from agentsync_mcp.tools import locks
 
 
 @pytest.fixture
-async def services(tmp_path: Path):
+async def services(tmp_path: Path, db_template: Path) -> AsyncIterator[dict]:
+    # Start from the session's schema template so initialize() has nothing to apply.
+    shutil.copyfile(db_template, tmp_path / "integration.db")
     db = Database(tmp_path / "integration.db")
     await db.initialize()
 
@@ -30,6 +38,7 @@ async def services(tmp_path: Path):
     yield {"db": db, "lock_manager": lm, "work_queue": wq, "event_bus": eb}
 
     await lm.stop()
+    await db.close()
 
 
 @pytest.mark.asyncio
@@ -45,12 +54,10 @@ class TestMCPToolFlow:
         # Register agent
         await db.register_agent(agent)
 
-        # Lock files
-        locked = []
-        for f in files:
-            r = await lm.acquire_lock(f, agent, "Fix auth bug", ttl_seconds=300)
-            assert r["success"] is True
-            locked.append(f)
+        # Lock files in one batch
+        results = await lm.acquire_locks(files, agent, "Fix auth bug", ttl_seconds=300)
+        assert all(r["success"] for r in results.values())
+        locked = list(results)
 
         # Create work item
         wid = await wq.create_work_item(agent, "Fix auth bug", locked)
@@ -62,8 +69,7 @@ class TestMCPToolFlow:
 
         # Complete work and release
         await wq.complete_work(agent, commit_hash="abc123")
-        for f in locked:
-            await lm.release_lock(f, agent)
+        await asyncio.gather(*(lm.release_lock(f, agent) for f in locked))
 
         # Verify clean state
         assert await lm.get_active_lock_count() == 0
@@ -73,8 +79,7 @@ class TestMCPToolFlow:
         db: Database = services["db"]
         lm: LockManager = services["lock_manager"]
 
-        await db.register_agent("agent-a")
-        await db.register_agent("agent-b")
+        await asyncio.gather(db.register_agent("agent-a"), db.register_agent("agent-b"))
 
         # Agent A locks the file
         r1 = await lm.acquire_lock("shared.py", "agent-a", "Working on shared", ttl_seconds=300)
@@ -116,3 +121,57 @@ class TestMCPToolFlow:
         assert len(events) == 2
         assert events[0]["type"] == "lock_acquired"
         assert events[1]["type"] == "lock_released"
+
+    async def test_blocked_holders_fetched_in_one_query(
+        self, services: dict, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        db: Database = services["db"]
+        lm: LockManager = services["lock_manager"]
+
+        await db.register_agent("agent-a")
+        for f in ("a.py", "b.py"):
+            assert (await lm.acquire_lock(f, "agent-a", "Feature work", ttl_seconds=300))["success"]
+
+        async def no_single_lookups(agent_id: str) -> None:
+            raise AssertionError(f"unexpected get_agent({agent_id!r})")
+
+        monkeypatch.setattr(db, "get_agent", no_single_lookups)
+
+        mcp = FastMCP("test")
+        locks.register(mcp, lm, services["work_queue"], services["event_bus"], db, "agent-b")
+        content = await mcp.call_tool(
+            "request_file_lock",
+            {"files": ["a.py", "b.py", "c.py"], "description": "Refactor", "atomic": False},
+        )
+        result = json.loads(content[0].text)
+
+        assert result["locked"] == ["c.py"]
+        assert result["not_locked"] == []
+        assert [b["locked_by_session"]["agent_id"] for b in result["blocked"]] == [
+            "agent-a",
+            "agent-a",
+        ]
+
+    async def test_atomic_request_locks_nothing_when_blocked(self, services: dict) -> None:
+        db: Database = services["db"]
+        lm: LockManager = services["lock_manager"]
+        wq: WorkQueue = services["work_queue"]
+
+        await db.register_agent("agent-a")
+        assert (await lm.acquire_lock("a.py", "agent-a", "Feature work", ttl_seconds=300))[
+            "success"
+        ]
+
+        mcp = FastMCP("test")
+        locks.register(mcp, lm, wq, services["event_bus"], db, "agent-b")
+        content = await mcp.call_tool(
+            "request_file_lock", {"files": ["a.py", "c.py", "d.py"], "description": "Refactor"}
+        )
+        result = json.loads(content[0].text)
+
+        assert result["success"] is False
+        assert result["locked"] == []
+        assert [b["file"] for b in result["blocked"]] == ["a.py"]
+        assert result["not_locked"] == ["c.py", "d.py"]
+        assert await lm.get_lock_info("c.py") is None
+        assert await wq.get_active_work("agent-b") == []
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sqlite3
+import subprocess
+import threading
+from pathlib import Path
+
+import pytest
+
+from agentsync_mcp.db.database import Database
+from agentsync_mcp.services import auto_coordinator
+from agentsync_mcp.services.auto_coordinator import (
+    AutoCoordinationOptions,
+    AutoCoordinator,
+    _git_status_dirty_files,
+    _start_watcher,
+)
+from agentsync_mcp.services.lock_manager import LockManager
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    _git(tmp_path, "config", "user.name", "Test")
+    (tmp_path / "tracked.py").write_text("x = 1\n")
+    _git(tmp_path, "add", "tracked.py")
+    _git(tmp_path, "commit", "-q", "-m", "init")
+    yield tmp_path
+    auto_coordinator._STATUS_CACHE.pop(tmp_path, None)
+
+
+class TestGitStatusDirtyFiles:
+    def test_reports_modified_and_untracked(self, repo: Path) -> None:
+        (repo / "tracked.py").write_text("x = 2\n")
+        (repo / "new.py").write_text("y = 1\n")
+
+        assert _git_status_dirty_files(repo) == {"tracked.py", "new.py"}
+
+    def test_cache_invalidated_by_index_change(self, repo: Path) -> None:
+        assert _git_status_dirty_files(repo) == set()
+
+        # A worktree-only change is served from the cache until the TTL ...
+        (repo / "new.py").write_text("y = 1\n")
+        assert _git_status_dirty_files(repo) == set()
+
+        # ... but touching the index invalidates it immediately.
+        _git(repo, "add", "new.py")
+        assert _git_status_dirty_files(repo) == {"new.py"}
+
+    def test_cache_expires_after_ttl(self, repo: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        assert _git_status_dirty_files(repo) == set()
+        (repo / "new.py").write_text("y = 1\n")
+
+        monkeypatch.setattr(auto_coordinator, "_STATUS_CACHE_TTL_SECONDS", 0.0)
+        assert _git_status_dirty_files(repo) == {"new.py"}
+
+    def test_reports_rename_target_and_paths_with_spaces(self, repo: Path) -> None:
+        _git(repo, "mv", "tracked.py", "renamed.py")
+        (repo / "with space.py").write_text("z = 1\n")
+
+        assert _git_status_dirty_files(repo) == {"renamed.py", "with space.py"}
+
+    def test_undecodable_paths_round_trip(self, repo: Path) -> None:
+        raw_name = b"caf\xe9.py"
+        with open(os.path.join(os.fsencode(repo), raw_name), "w") as fh:
+            fh.write("z = 1\n")
+
+        assert _git_status_dirty_files(repo) == {os.fsdecode(raw_name)}
+
+
+class TestStartWatcher:
+    def test_reports_worktree_changes_but_not_git_internals(self, repo: Path) -> None:
+        pytest.importorskip("watchdog")
+        changed = threading.Event()
+        observer = _start_watcher(repo, changed.set)
+        assert observer is not None
+        try:
+            (repo / ".git" / "objects" / "scratch").write_text("x")
+            assert not changed.wait(0.3)
+
+            (repo / "tracked.py").write_text("x = 2\n")
+            assert changed.wait(2.0)
+        finally:
+            observer.stop()
+            observer.join()
+
+
+@pytest.mark.asyncio
+class TestAutoCoordinator:
+    async def test_auto_locked_files_stay_sorted(
+        self, repo: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.chdir(repo)
+        coordinator = AutoCoordinator(AutoCoordinationOptions(client="codex", command=["true"]))
+        for path in ("c.py", "a.py", "b.py", "a.py"):
+            coordinator._track_auto_lock(path)
+        coordinator._untrack_auto_lock("b.py")
+
+        assert coordinator._auto_locked_sorted == ["a.py", "c.py"]
+        assert coordinator.auto_locked_files == {"a.py", "c.py"}
+
+    async def test_poll_dirty_files_runs_off_loop(
+        self, repo: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.chdir(repo)
+        coordinator = AutoCoordinator(AutoCoordinationOptions(client="codex", command=["true"]))
+        (repo / "new.py").write_text("y = 1\n")
+
+        results = await asyncio.gather(
+            coordinator._poll_dirty_files(), coordinator._poll_dirty_files()
+        )
+        assert results == [{"new.py"}, {"new.py"}]
+
+    async def test_failed_exit_release_is_logged_and_others_proceed(
+        self,
+        repo: Path,
+        db: Database,
+        lock_manager: LockManager,
+        monkeypatch: pytest.MonkeyPatch,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        monkeypatch.chdir(repo)
+        coordinator = AutoCoordinator(AutoCoordinationOptions(client="codex", command=["true"]))
+        for path in ("a.py", "b.py"):
+            assert (await lock_manager.acquire_lock(path, "agent-1", "auto"))["success"]
+            coordinator._track_auto_lock(path)
+        release_lock = lock_manager.release_lock
+
+        async def failing_release(file_path: str, agent_id: str) -> bool:
+            if file_path == "a.py":
+                raise sqlite3.OperationalError("disk I/O error")
+            return await release_lock(file_path, agent_id)
+
+        monkeypatch.setattr(lock_manager, "release_lock", failing_release)
+        with caplog.at_level(logging.WARNING, logger=auto_coordinator.__name__):
+            await coordinator._release_all_auto_locks(lock_manager, db, "agent-1")
+
+        assert "Failed to release auto-lock on a.py: disk I/O error" in caplog.messages
+        assert await lock_manager.get_lock_info("b.py") is None
+        assert coordinator.auto_locked_files == set()
+
+    async def test_poll_without_watcher_bypasses_status_cache(
+        self, repo: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.chdir(repo)
+        coordinator = AutoCoordinator(AutoCoordinationOptions(client="codex", command=["true"]))
+        assert await coordinator._poll_dirty_files() == set()
+
+        # A worktree-only edit leaves the index/HEAD cache key unchanged.
+        (repo / "new.py").write_text("y = 1\n")
+
+        assert await coordinator._poll_dirty_files() == {"new.py"}
+
+    async def test_run_locks_new_files_and_releases_on_exit(
+        self, repo: Path, tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.chdir(repo)
+        monkeypatch.setattr(auto_coordinator, "_STATUS_CACHE_TTL_SECONDS", 0.0)
+        db_path = tmp_path_factory.mktemp("db") / "agentsync.db"
+        coordinator = AutoCoordinator(
+            AutoCoordinationOptions(
+                client="codex",
+                command=["sh", "-c", "echo y > new.py; sleep 0.5"],
+                db_path=str(db_path),
+                poll_interval=0.05,
+            )
+        )
+
+        assert await coordinator.run() == 0
+
+        with sqlite3.connect(db_path) as conn:
+            events = conn.execute(
+                "SELECT event_type, details FROM event_log ORDER BY id"
+            ).fetchall()
+        assert ("auto_lock_acquired", '{"file":"new.py"}') in events
+        assert ("auto_lock_released_exit", '{"file":"new.py"}') in events
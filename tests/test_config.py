@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from agentsync_mcp.utils import config as config_module
+from agentsync_mcp.utils.config import Config
+
+
+def test_from_env_defaults() -> None:
+    assert Config.from_env({}) == Config()
+
+
+def test_from_env_parses_only_set_variables(monkeypatch: pytest.MonkeyPatch) -> None:
+    def no_parse(value: str) -> int:
+        raise AssertionError(f"unexpected parse of {value!r}")
+
+    monkeypatch.setitem(config_module._ENV_FIELDS, "port", ("AGENTSYNC_PORT", no_parse))
+
+    assert Config.from_env({}).port == 8080
+
+
+def test_from_env_overrides() -> None:
+    config = Config.from_env(
+        {
+            "AGENTSYNC_DB_PATH": "/tmp/agentsync.db",
+            "AGENTSYNC_PORT": "9000",
+            "AGENTSYNC_DEFAULT_TTL": "60",
+            "ANTHROPIC_API_KEY": "sk-test",
+            "UNRELATED": "ignored",
+        }
+    )
+
+    assert config.db_path == Path("/tmp/agentsync.db")
+    assert config.port == 9000
+    assert config.default_ttl_seconds == 60
+    assert config.anthropic_api_key == "sk-test"
+    assert config.lock_cleanup_interval == Config().lock_cleanup_interval
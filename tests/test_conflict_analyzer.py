@@ -1,15 +1,35 @@
 from __future__ import annotations
 
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
 import pytest
 
 from agentsync_mcp.services.conflict_analyzer import ConflictAnalyzer
+from agentsync_mcp.services.work_queue import WorkQueue
+
+
+class _FakeClient:
+    """Stands in for the Anthropic client, returning a fixed JSON reply."""
+
+    def __init__(self, reply: str) -> None:
+        self.messages = self
+        self._reply = reply
+        self._in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, **kwargs: Any) -> SimpleNamespace:
+        self._in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        await asyncio.sleep(0.01)
+        self._in_flight -= 1
+        return SimpleNamespace(content=[SimpleNamespace(text=self._reply)])
 
 
 @pytest.mark.asyncio
 class TestConflictAnalyzer:
-    async def test_no_conflicts_without_api_key(
-        self, conflict_analyzer: ConflictAnalyzer
-    ) -> None:
+    async def test_no_conflicts_without_api_key(self, conflict_analyzer: ConflictAnalyzer) -> None:
         """Without ANTHROPIC_API_KEY the analyzer gracefully returns no conflicts."""
         conflicts = await conflict_analyzer.detect_semantic_conflicts(
             agent_id="agent-1",
@@ -26,3 +46,37 @@ class TestConflictAnalyzer:
         )
         assert suggestion["strategy"] == "manual"
         assert suggestion["confidence"] == 0.0
+
+    async def test_checks_run_concurrently_and_keep_order(
+        self, conflict_analyzer: ConflictAnalyzer, work_queue: WorkQueue
+    ) -> None:
+        for n in range(3):
+            await work_queue.register_action(
+                f"agent-{n}", "modify", ["a.py", "b.py"], f"Change {n}"
+            )
+        client = _FakeClient('{"conflicts": true, "severity": "low", "reason": "overlap"}')
+        conflict_analyzer._client = client
+
+        conflicts = await conflict_analyzer.detect_semantic_conflicts(
+            agent_id="agent-0", files=["a.py", "b.py"], intent="Refactor"
+        )
+
+        assert [(c["file"], c["conflicting_with"]) for c in conflicts] == [
+            ("a.py", "agent-2"),
+            ("a.py", "agent-1"),
+            ("b.py", "agent-2"),
+            ("b.py", "agent-1"),
+        ]
+        assert client.max_in_flight > 1
+
+    async def test_merge_suggestion_awaits_client(
+        self, conflict_analyzer: ConflictAnalyzer
+    ) -> None:
+        conflict_analyzer._client = _FakeClient(
+            '{"strategy": "accept_both", "reasoning": "disjoint", "confidence": 0.9, "warnings": []}'
+        )
+
+        suggestion = await conflict_analyzer.generate_merge_suggestion(
+            "src/auth.py", "branch-a", "branch-b"
+        )
+        assert suggestion["strategy"] == "accept_both"
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import asyncio
+import sqlite3
 from datetime import datetime, timedelta
+from pathlib import Path
 
 import pytest
 
-from agentsync_mcp.db.database import Database
+from agentsync_mcp.db import database as database_module
+from agentsync_mcp.db.database import SCHEMA_VERSION, Database
 from agentsync_mcp.models.lock import LockInfo
 
 
@@ -46,12 +50,13 @@ class TestDatabase:
         assert sessions[0]["metadata"]["detected_from"] == "env:CODEX_*"
 
     async def test_create_and_get_lock(self, db: Database) -> None:
+        now = datetime.now()
         lock = LockInfo(
             file_path="a.py",
             agent_id="agent-1",
             description="work",
-            locked_at=datetime.now(),
-            expires_at=datetime.now() + timedelta(minutes=30),
+            locked_at=now,
+            expires_at=now + timedelta(minutes=30),
         )
         lock_id = await db.create_lock(lock)
         assert lock_id > 0
@@ -60,27 +65,56 @@ class TestDatabase:
         assert len(locks) == 1
         assert locks[0]["file_path"] == "a.py"
 
+    async def test_create_locks_bulk(self, db: Database) -> None:
+        now = datetime.now()
+        locks = [
+            LockInfo(
+                file_path=path,
+                agent_id="agent-1",
+                description="work",
+                locked_at=now,
+                expires_at=now + timedelta(minutes=30),
+            )
+            for path in ("a.py", "b.py")
+        ]
+        await db.create_locks_bulk(locks)
+
+        rows = await db.get_active_locks()
+        assert {row["file_path"] for row in rows} == {"a.py", "b.py"}
+        cursor = await db.conn.execute(
+            "SELECT COUNT(*) FROM event_log WHERE event_type = 'lock_acquired'"
+        )
+        assert (await cursor.fetchone())[0] == 2
+
     async def test_release_lock(self, db: Database) -> None:
+        now = datetime.now()
         lock = LockInfo(
             file_path="a.py",
             agent_id="agent-1",
             description="work",
-            locked_at=datetime.now(),
-            expires_at=datetime.now() + timedelta(minutes=30),
+            locked_at=now,
+            expires_at=now + timedelta(minutes=30),
         )
         await db.create_lock(lock)
         await db.release_lock("a.py", "agent-1")
 
         locks = await db.get_active_locks()
         assert len(locks) == 0
+        row = await db._fetchone("SELECT locked_at, released_at FROM file_locks")
+        # Stamped in the same local ISO layout as the Python-written columns
+        # (SQLite keeps milliseconds, so compare loosely).
+        released_at = datetime.fromisoformat(row["released_at"])
+        assert abs(released_at - datetime.fromisoformat(row["locked_at"])) < timedelta(seconds=5)
+        assert "T" in row["released_at"]
 
     async def test_cleanup_expired_locks(self, db: Database) -> None:
+        now = datetime.now()
         lock = LockInfo(
             file_path="a.py",
             agent_id="agent-1",
             description="work",
-            locked_at=datetime.now() - timedelta(hours=1),
-            expires_at=datetime.now() - timedelta(minutes=1),  # already expired
+            locked_at=now - timedelta(hours=1),
+            expires_at=now - timedelta(minutes=1),  # already expired
         )
         await db.create_lock(lock)
         count = await db.cleanup_expired_locks()
@@ -96,6 +130,8 @@ class TestDatabase:
 
         ok = await db.complete_work_item("agent-1", "abc123")
         assert ok is True
+        row = await db._fetchone("SELECT completed_at FROM work_items")
+        assert "T" in row["completed_at"]
 
         items = await db.get_active_work_items("agent-1")
         assert len(items) == 0
@@ -108,10 +144,33 @@ class TestDatabase:
         actions = await db.get_recent_actions("a.py")
         assert len(actions) == 1
 
+    async def test_register_actions_bulk(self, db: Database) -> None:
+        await db.register_agent("agent-1")
+        ids = await db.register_actions_bulk(
+            [
+                ("agent-1", "modify", ["a.py", "b.py"], "Change A"),
+                ("agent-1", "create", ["c.py"], "Create C"),
+            ]
+        )
+        assert len(ids) == 2 and ids[0] < ids[1]
+
+        actions = await db.get_recent_actions("b.py")
+        assert [(a["id"], a["files"]) for a in actions] == [(ids[0], ["a.py", "b.py"])]
+        assert await db.register_actions_bulk([]) == []
+
     async def test_log_event(self, db: Database) -> None:
         # Should not raise
         await db.log_event("test_event", "agent-1", {"key": "value"})
 
+    async def test_log_event_details_are_compact_json(self, db: Database) -> None:
+        await db.log_event("detailed_event", "agent-1", {"file": "a.py"})
+        await db.log_event("detailed_event", "agent-1")
+        cursor = await db.conn.execute(
+            "SELECT details FROM event_log WHERE event_type = 'detailed_event' ORDER BY id"
+        )
+        rows = await cursor.fetchall()
+        assert [row["details"] for row in rows] == ['{"file":"a.py"}', None]
+
     async def test_create_conflict(self, db: Database) -> None:
         await db.register_agent("agent-1")
         await db.register_agent("agent-2")
@@ -119,3 +178,313 @@ class TestDatabase:
             "a.py", "agent-1", "agent-2", "semantic", "high", "Both modifying auth"
         )
         assert cid > 0
+
+    @pytest.mark.file_db
+    async def test_connection_pragmas(self, db: Database) -> None:
+        cursor = await db.conn.execute("PRAGMA journal_mode")
+        assert (await cursor.fetchone())[0] == "wal"
+        cursor = await db.conn.execute("PRAGMA synchronous")
+        assert (await cursor.fetchone())[0] == 1  # NORMAL
+        cursor = await db.conn.execute("PRAGMA busy_timeout")
+        assert (await cursor.fetchone())[0] == 5000
+        cursor = await db.conn.execute("PRAGMA temp_store")
+        assert (await cursor.fetchone())[0] == 2  # MEMORY
+        cursor = await db.conn.execute("PRAGMA wal_autocheckpoint")
+        assert (await cursor.fetchone())[0] == 1000
+        async with db._acquire_reader() as reader:
+            cursor = await reader.execute("PRAGMA busy_timeout")
+            assert (await cursor.fetchone())[0] == 5000
+
+    async def test_concurrent_writes_are_coalesced(self, db: Database) -> None:
+        await asyncio.gather(*(db.log_event("burst", "agent-1", {"n": n}) for n in range(50)))
+        cursor = await db.conn.execute("SELECT COUNT(*) FROM event_log WHERE event_type = 'burst'")
+        assert (await cursor.fetchone())[0] == 50
+
+    async def test_failed_write_does_not_abort_batch(self, db: Database) -> None:
+        results = await asyncio.gather(
+            db.log_event("ok", "agent-1"),
+            db._enqueue_write("INSERT INTO missing_table VALUES (1)"),
+            db.log_event("ok", "agent-2"),
+            return_exceptions=True,
+        )
+        assert isinstance(results[1], Exception)
+        cursor = await db.conn.execute("SELECT COUNT(*) FROM event_log WHERE event_type = 'ok'")
+        assert (await cursor.fetchone())[0] == 2
+
+    @pytest.mark.file_db
+    async def test_write_retries_while_database_is_locked(self, db: Database) -> None:
+        await db.conn.execute("PRAGMA busy_timeout=0")
+        other = sqlite3.connect(db.db_path, isolation_level=None)
+        other.execute("BEGIN IMMEDIATE")
+
+        async def release_later() -> None:
+            await asyncio.sleep(0.005)
+            other.execute("COMMIT")
+
+        releaser = asyncio.create_task(release_later())
+        await db.log_event("after_busy", "agent-1")
+        await releaser
+        other.close()
+
+        cursor = await db.conn.execute(
+            "SELECT COUNT(*) FROM event_log WHERE event_type = 'after_busy'"
+        )
+        assert (await cursor.fetchone())[0] == 1
+
+    async def test_commit_failure_only_fails_the_op_at_fault(self, db: Database) -> None:
+        async def orphan_file_row(conn) -> None:
+            # Deferred, so the FK violation only surfaces at COMMIT.
+            await conn.execute("PRAGMA defer_foreign_keys=ON")
+            await conn.execute(
+                "INSERT INTO work_item_files (work_item_id, position, file_path) VALUES (999, 0, 'x')"
+            )
+
+        results = await asyncio.gather(
+            db._submit_write(orphan_file_row),
+            db.log_event("ok", "agent-1"),
+            return_exceptions=True,
+        )
+
+        assert isinstance(results[0], sqlite3.IntegrityError)
+        assert results[1] is None
+        cursor = await db.conn.execute("SELECT COUNT(*) FROM event_log WHERE event_type = 'ok'")
+        assert (await cursor.fetchone())[0] == 1
+
+    async def test_failed_rollback_does_not_stall_the_writer(
+        self, db: Database, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        rollback = db.conn.rollback
+        calls = 0
+
+        async def rollback_fails_once() -> None:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise sqlite3.OperationalError("disk I/O error")
+            await rollback()
+
+        monkeypatch.setattr(db.conn, "rollback", rollback_fails_once)
+
+        async def bad_commit(conn) -> None:
+            await conn.execute("PRAGMA defer_foreign_keys=ON")
+            await conn.execute(
+                "INSERT INTO work_item_files (work_item_id, position, file_path) VALUES (999, 0, 'x')"
+            )
+
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                db._submit_write(bad_commit),
+                db.log_event("first", "agent-1"),
+                return_exceptions=True,
+            ),
+            timeout=5,
+        )
+        assert isinstance(results[0], sqlite3.Error)
+        await asyncio.wait_for(db.log_event("after", "agent-1"), timeout=5)
+
+        cursor = await db.conn.execute("SELECT COUNT(*) FROM event_log WHERE event_type = 'after'")
+        assert (await cursor.fetchone())[0] == 1
+
+    async def test_schema_version_recorded(self, db: Database) -> None:
+        cursor = await db.conn.execute("PRAGMA user_version")
+        assert (await cursor.fetchone())[0] == SCHEMA_VERSION
+
+    async def test_active_lock_lookups_use_partial_index(self, db: Database) -> None:
+        cursor = await db.conn.execute(
+            """
+            EXPLAIN QUERY PLAN
+            SELECT id FROM file_locks WHERE status = 'active' AND expires_at < ?
+            """,
+            ("2100-01-01T00:00:00",),
+        )
+        plan = " ".join(row["detail"] for row in await cursor.fetchall())
+        assert "idx_locks_expires" in plan
+
+    async def test_recent_actions_file_filter_applies_before_limit(self, db: Database) -> None:
+        await db.register_agent("agent-1")
+        await db.register_actions_bulk(
+            [("agent-1", "modify", ["target.py"], "Old change")]
+            + [("agent-1", "modify", [f"other_{n}.py"], "Noise") for n in range(120)]
+        )
+
+        actions = await db.get_recent_actions("target.py")
+        assert [a["intent"] for a in actions] == ["Old change"]
+        assert actions[0]["files"] == ["target.py"]
+
+    async def test_legacy_json_files_are_backfilled(self, tmp_path: Path) -> None:
+        legacy = Database(tmp_path / "legacy.db")
+        await legacy.initialize()
+        await legacy.conn.execute(
+            "INSERT INTO work_items (agent_id, description, files) VALUES (?, ?, ?)",
+            ("agent-1", "Legacy work", '["a.py", "b.py"]'),
+        )
+        # Databases created before schema versioning report user_version 0.
+        await legacy.conn.execute("PRAGMA user_version=0")
+        await legacy.close()
+
+        reopened = Database(tmp_path / "legacy.db")
+        await reopened.initialize()
+        items = await reopened.get_active_work_items("agent-1")
+        await reopened.close()
+        assert items[0]["files"] == ["a.py", "b.py"]
+
+    async def test_version_bump_backfills_rows_from_older_processes(self, tmp_path: Path) -> None:
+        first = Database(tmp_path / "shared.db")
+        await first.initialize()
+        # An older server process on the same file only fills the JSON column,
+        # after version 1 had already been recorded.
+        await first.conn.execute(
+            "INSERT INTO agent_actions (agent_id, action_type, files, intent) VALUES (?, ?, ?, ?)",
+            ("agent-1", "modify", '["a.py"]', "Old process"),
+        )
+        await first.conn.execute("PRAGMA user_version=1")
+        await first.close()
+
+        reopened = Database(tmp_path / "shared.db")
+        await reopened.initialize()
+        actions = await reopened.get_recent_actions("a.py")
+        await reopened.close()
+        assert [a["files"] for a in actions] == [["a.py"]]
+
+    async def test_failed_schema_script_is_rolled_back(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(database_module, "_SCHEMA_SQL", "CREATE TABLE broken (;")
+        broken = Database(tmp_path / "broken.db")
+        with pytest.raises(sqlite3.OperationalError):
+            await broken.initialize()
+        try:
+            assert not broken.conn.in_transaction
+        finally:
+            await broken.close()
+
+    async def test_newer_schema_is_left_alone(
+        self, tmp_path: Path, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        first = Database(tmp_path / "newer.db")
+        await first.initialize()
+        await first.conn.execute(f"PRAGMA user_version={SCHEMA_VERSION + 1}")
+        await first.conn.execute("CREATE INDEX idx_work_status ON work_items(status)")
+        await first.close()
+
+        reopened = Database(tmp_path / "newer.db")
+        await reopened.initialize()
+        cursor = await reopened.conn.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE name = 'idx_work_status'"
+        )
+        (index_count,) = await cursor.fetchone()
+        await reopened.close()
+
+        assert index_count == 1
+        assert "newer than supported" in caplog.text
+
+    async def test_concurrent_initialize_migrates_once(self, tmp_path: Path) -> None:
+        first = Database(tmp_path / "shared.db")
+        await first.initialize()
+        await first.conn.execute("PRAGMA user_version=0")
+        await first.close()
+
+        processes = [Database(tmp_path / "shared.db") for _ in range(4)]
+        await asyncio.gather(*(database.initialize() for database in processes))
+        try:
+            for database in processes:
+                cursor = await database.conn.execute("PRAGMA user_version")
+                assert (await cursor.fetchone())[0] == SCHEMA_VERSION
+        finally:
+            for database in processes:
+                await database.close()
+
+    async def test_cleanup_keeps_unexpired_locks(self, db: Database) -> None:
+        now = datetime.now()
+        await db.create_lock(
+            LockInfo(
+                file_path="a.py",
+                agent_id="agent-1",
+                description="work",
+                locked_at=now,
+                expires_at=now + timedelta(seconds=5),
+            )
+        )
+        assert await db.cleanup_expired_locks() == 0
+        assert len(await db.get_active_locks()) == 1
+
+    async def test_optimize(self, db: Database) -> None:
+        # Should not raise
+        await db.optimize()
+
+    async def test_cleanup_without_expired_locks_skips_write(
+        self, db: Database, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        async def fail_write(*args: object) -> None:
+            raise AssertionError("cleanup should not queue a write")
+
+        monkeypatch.setattr(db, "_enqueue_write", fail_write)
+        assert await db.cleanup_expired_locks() == 0
+
+    @pytest.mark.file_db
+    async def test_reads_use_query_only_connections(self, db: Database) -> None:
+        async with db._acquire_reader() as reader:
+            assert reader is not db.conn
+            cursor = await reader.execute("PRAGMA query_only")
+            assert (await cursor.fetchone())[0] == 1
+
+        await db.register_agent("agent-1")
+        assert await db.get_all_active_agents() == ["agent-1"]
+
+    async def test_recent_actions_pagination(self, db: Database) -> None:
+        await db.register_agent("agent-1")
+        await db.register_actions_bulk(
+            [("agent-1", "modify", ["a.py"], f"Change {n}") for n in range(5)]
+        )
+
+        first, cursor = await db.get_recent_actions_page("a.py", limit=3)
+        assert [a["intent"] for a in first] == ["Change 4", "Change 3", "Change 2"]
+        assert cursor is not None
+
+        second, cursor = await db.get_recent_actions_page("a.py", limit=3, before_id=cursor)
+        assert [a["intent"] for a in second] == ["Change 1", "Change 0"]
+        assert cursor is None
+
+    async def test_get_agents(self, db: Database) -> None:
+        await db.register_agent("agent-1", "codex")
+        await db.register_agent("agent-2", "claude")
+
+        agents = await db.get_agents(["agent-1", "agent-2", "missing"])
+
+        assert set(agents) == {"agent-1", "agent-2"}
+        assert agents["agent-2"] == await db.get_agent("agent-2")
+
+    async def test_touches_are_buffered_until_flush(self, db: Database) -> None:
+        await db.register_agent("agent-1")
+        await db.set_agent_status("agent-1", "inactive")
+
+        for _ in range(5):
+            await db.touch_agent("agent-1")
+        assert (await db.get_agent("agent-1"))["status"] == "inactive"
+
+        await db.flush()
+        assert (await db.get_agent("agent-1"))["status"] == "active"
+        assert db._pending_touches == set()
+
+    async def test_status_change_is_not_undone_by_earlier_touch(self, db: Database) -> None:
+        await db.register_agent("agent-1")
+
+        await db.touch_agent("agent-1")
+        await db.set_agent_status("agent-1", "inactive")
+        await db.flush()
+
+        assert (await db.get_agent("agent-1"))["status"] == "inactive"
+
+    async def test_log_event_nowait_is_buffered_until_flush(self, db: Database) -> None:
+        for n in range(3):
+            db.log_event_nowait("buffered", "agent-1", {"n": n})
+        cursor = await db.conn.execute(
+            "SELECT COUNT(*) FROM event_log WHERE event_type = 'buffered'"
+        )
+        assert (await cursor.fetchone())[0] == 0
+
+        await db.flush()
+        cursor = await db.conn.execute(
+            "SELECT COUNT(*) FROM event_log WHERE event_type = 'buffered'"
+        )
+        assert (await cursor.fetchone())[0] == 3
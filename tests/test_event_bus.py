@@ -65,3 +65,18 @@ class TestEventBus:
 
         await event_bus.publish("test", {"data": "ok"})
         assert len(received) == 1
+
+    async def test_wildcard_unsubscribe(self, event_bus: EventBus) -> None:
+        received: list[dict] = []
+
+        async def listener(event: dict) -> None:
+            received.append(event)
+
+        event_bus.subscribe("*", listener)
+        event_bus.subscribe("*", listener)
+        await event_bus.publish("test", {"n": 1})
+        assert len(received) == 1  # duplicate subscription is ignored
+
+        event_bus.unsubscribe("*", listener)
+        await event_bus.publish("test", {"n": 2})
+        assert len(received) == 1
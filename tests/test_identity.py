@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+from agentsync_mcp.services import identity
+from agentsync_mcp.services.identity import (
+    _get_process_markers,
+    _ps_table,
+    _read_proc,
+    detect_agent_session_identity,
+)
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="/proc is Linux-only")
+class TestProcessMarkers:
+    def test_read_proc_matches_ps(self) -> None:
+        command, parent = _read_proc(os.getpid())
+
+        assert parent == str(os.getppid())
+        assert (command, parent) == _ps_table()[os.getpid()]
+
+    def test_markers_walk_parents(self) -> None:
+        markers = _get_process_markers(os.getpid())
+
+        assert markers[0] == _ps_table()[os.getpid()][0]
+
+    def test_markers_fall_back_to_ps_without_proc(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        expected = _get_process_markers(os.getpid())
+        monkeypatch.setattr(identity, "_read_proc", lambda pid: None)
+
+        assert _get_process_markers(os.getpid())[0] == expected[0]
+
+
+class TestDetectAgentSessionIdentity:
+    def test_memoized_per_env(self) -> None:
+        env = {"CODEX_SESSION_ID": "abc", "AGENTSYNC_AGENT_ID": "codex-1", "PATH": "/usr/bin"}
+
+        first = detect_agent_session_identity(env)
+        assert detect_agent_session_identity({**env, "PATH": "/bin"}) is first
+        assert first.agent_type == "codex"
+        assert first.session_label == "abc"
+
+        other = detect_agent_session_identity({"CLAUDE_SESSION_ID": "xyz"})
+        assert other is not first
+        assert other.agent_type == "claude"
+
+    def test_generated_agent_id_is_fresh_per_call(self) -> None:
+        env = {"CODEX_SESSION_ID": "abc"}
+
+        first = detect_agent_session_identity(env)
+        second = detect_agent_session_identity(env)
+
+        assert first.agent_id != second.agent_id
+        assert first.agent_id.startswith(f"codex-{first.host}-{os.getpid()}-")
+        assert first.session_label == second.session_label == "abc"
+
+    def test_forked_process_is_not_served_parent_identity(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        env = {"AGENTSYNC_AGENT_ID": "agent-x"}
+        parent = detect_agent_session_identity(env)
+
+        monkeypatch.setattr(identity.os, "getpid", lambda: parent.pid + 1)
+        assert detect_agent_session_identity(env).pid == parent.pid + 1
+
+    def test_record_metadata_is_a_copy(self) -> None:
+        ident = detect_agent_session_identity({"AGENTSYNC_AGENT_ID": "agent-x"})
+
+        record = ident.to_agent_record()
+        record["metadata"]["extra"] = True
+        record["metadata"]["process_markers"].append("injected")
+        fresh = detect_agent_session_identity({"AGENTSYNC_AGENT_ID": "agent-x"})
+        assert "extra" not in fresh.to_agent_record()["metadata"]
+        assert "injected" not in fresh.metadata["process_markers"]
+
+    def test_branch_switch_is_seen(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        env = {"AGENTSYNC_AGENT_ID": "agent-x"}
+        monkeypatch.setattr(identity, "_git_repo_info", lambda: ("/repo", "main"))
+        assert detect_agent_session_identity(env).git_branch == "main"
+
+        monkeypatch.setattr(identity, "_git_repo_info", lambda: ("/repo", "feature"))
+        switched = detect_agent_session_identity(env)
+        assert switched.git_branch == "feature"
+        assert switched.session_label.endswith(f"-repo-feature-{switched.pid}")
+
+    def test_env_markers_and_keyword_detection(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(identity, "_get_process_markers", lambda ppid: [])
+        ident = detect_agent_session_identity(
+            {"MY_CURSOR_TOKEN": "1", "AGENTSYNC_SESSION_LABEL": "s", "aider_model": "x"}
+        )
+
+        assert ident.agent_type == "cursor"
+        assert ident.metadata["detected_from"] == "env:*cursor*"
+        assert ident.metadata["env_markers"] == ("AGENTSYNC_SESSION_LABEL", "aider_model")
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from agentsync_mcp.utils import jsonio
+
+_SAMPLE = {"file": "src/é.py", "files": ["a.py", "b.py"], "work_id": 3, "details": None}
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_round_trip_and_format(monkeypatch: pytest.MonkeyPatch, use_orjson: bool) -> None:
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(jsonio, "orjson", None)
+
+    text = jsonio.dumps(_SAMPLE)
+
+    assert text == '{"file":"src/é.py","files":["a.py","b.py"],"work_id":3,"details":null}'
+    assert jsonio.loads(text) == _SAMPLE
+    with pytest.raises(json.JSONDecodeError):
+        jsonio.loads("{not json")
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import asyncio
+from datetime import datetime, timedelta
+
 import pytest
 
+from agentsync_mcp.models.lock import LockInfo
 from agentsync_mcp.services.lock_manager import LockManager
 
 
@@ -41,13 +45,32 @@ class TestLockManager:
         r2 = await lock_manager.acquire_lock("src/auth.py", "agent-1", "Fix auth", ttl_seconds=60)
         assert r2["success"] is True
 
+    async def test_failed_renewal_leaves_cached_lock_untouched(
+        self, lock_manager: LockManager, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        await lock_manager.acquire_lock("src/auth.py", "agent-1", "Fix auth", ttl_seconds=60)
+        cached = (await lock_manager._load_locks())["src/auth.py"]
+        before = cached.to_dict()
+
+        async def failing_write(*args: object) -> None:
+            raise RuntimeError("disk full")
+
+        monkeypatch.setattr(lock_manager.db, "update_lock_expiry", failing_write)
+        with pytest.raises(RuntimeError):
+            await lock_manager.acquire_lock("src/auth.py", "agent-1", "Fix auth", ttl_seconds=600)
+
+        assert cached.to_dict() == before
+        assert lock_manager._locks["src/auth.py"].to_dict() == before
+
     async def test_expired_lock_freed(self, lock_manager: LockManager) -> None:
         # Acquire with 0-second TTL → immediately expired
         r1 = await lock_manager.acquire_lock("src/auth.py", "agent-1", "Quick edit", ttl_seconds=0)
         assert r1["success"] is True
 
         # Another agent should be able to acquire since it's expired
-        r2 = await lock_manager.acquire_lock("src/auth.py", "agent-2", "Another edit", ttl_seconds=60)
+        r2 = await lock_manager.acquire_lock(
+            "src/auth.py", "agent-2", "Another edit", ttl_seconds=60
+        )
         assert r2["success"] is True
 
     async def test_release_wrong_owner(self, lock_manager: LockManager) -> None:
@@ -82,8 +105,205 @@ class TestLockManager:
         count = await lock_manager.release_all_agent_locks("agent-1")
         assert count == 2
         assert await lock_manager.get_active_lock_count() == 0
+        assert "agent-1" not in lock_manager._by_agent
+
+    async def test_by_agent_index_follows_ownership(self, lock_manager: LockManager) -> None:
+        await lock_manager.acquire_lock("a.py", "agent-1", "work", ttl_seconds=60)
+        await lock_manager.acquire_lock("b.py", "agent-1", "work", ttl_seconds=60)
+        await lock_manager.acquire_lock("c.py", "agent-2", "work", ttl_seconds=60)
+        await lock_manager.release_lock("a.py", "agent-1")
+
+        assert lock_manager._by_agent == {"agent-1": {"b.py"}, "agent-2": {"c.py"}}
 
     async def test_active_lock_count(self, lock_manager: LockManager) -> None:
         assert await lock_manager.get_active_lock_count() == 0
         await lock_manager.acquire_lock("a.py", "agent-1", "work", ttl_seconds=60)
         assert await lock_manager.get_active_lock_count() == 1
+
+    async def test_acquire_locks_batch(self, lock_manager: LockManager) -> None:
+        await lock_manager.acquire_lock("b.py", "agent-2", "work on b", ttl_seconds=60)
+
+        results = await lock_manager.acquire_locks(
+            ["a.py", "b.py", "c.py"], "agent-1", "batch work", ttl_seconds=60
+        )
+        assert results["a.py"]["success"] is True
+        assert results["c.py"]["success"] is True
+        assert results["b.py"]["success"] is False
+        assert results["b.py"]["locked_by"] == "agent-2"
+
+        agent1_locks = await lock_manager.get_locks_by_agent("agent-1")
+        assert {lock["file_path"] for lock in agent1_locks} == {"a.py", "c.py"}
+
+    async def test_acquire_locks_renews_in_one_write(
+        self, lock_manager: LockManager, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        await lock_manager.acquire_locks(["a.py", "b.py"], "agent-1", "work", ttl_seconds=60)
+
+        async def no_single_renewals(*args: object) -> None:
+            raise AssertionError("renewal written outside the batch")
+
+        monkeypatch.setattr(lock_manager.db, "update_lock_expiry", no_single_renewals)
+        results = await lock_manager.acquire_locks(
+            ["a.py", "b.py", "c.py"], "agent-1", "work", ttl_seconds=600
+        )
+
+        assert all(result["success"] for result in results.values())
+        rows = {row["file_path"]: row for row in await lock_manager.db.get_active_locks()}
+        assert set(rows) == {"a.py", "b.py", "c.py"}
+        assert rows["a.py"]["expires_at"] == rows["c.py"]["expires_at"]
+
+    async def test_failed_batch_write_leaves_memory_untouched(
+        self, lock_manager: LockManager, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        await lock_manager.acquire_locks(["a.py"], "agent-1", "work", ttl_seconds=60)
+        cached = (await lock_manager._load_locks())["a.py"]
+        before = cached.to_dict()
+
+        async def failing_write(*args: object, **kwargs: object) -> None:
+            raise RuntimeError("disk full")
+
+        monkeypatch.setattr(lock_manager.db, "create_locks_bulk", failing_write)
+        with pytest.raises(RuntimeError):
+            await lock_manager.acquire_locks(["a.py", "b.py"], "agent-1", "work", ttl_seconds=600)
+
+        assert cached.to_dict() == before
+        assert set(lock_manager._locks) == {"a.py"}
+        assert lock_manager._locks["a.py"].to_dict() == before
+
+    async def test_atomic_acquire_locks_skips_on_conflict(self, lock_manager: LockManager) -> None:
+        await lock_manager.acquire_lock("a.py", "agent-1", "mine", ttl_seconds=60)
+        await lock_manager.acquire_lock("b.py", "agent-2", "theirs", ttl_seconds=60)
+        before = (await lock_manager.get_lock_info("a.py"))["expires_at"]
+
+        results = await lock_manager.acquire_locks(
+            ["a.py", "b.py", "c.py"], "agent-1", "batch", ttl_seconds=600, atomic=True
+        )
+
+        assert results["a.py"] == {"success": False, "skipped": True}
+        assert results["c.py"] == {"success": False, "skipped": True}
+        assert results["b.py"]["locked_by"] == "agent-2"
+        assert await lock_manager.get_lock_info("c.py") is None
+        assert (await lock_manager.get_lock_info("a.py"))["expires_at"] == before
+
+    async def test_get_lock_infos(self, lock_manager: LockManager) -> None:
+        await lock_manager.acquire_lock("a.py", "agent-1", "Editing")
+
+        infos = await lock_manager.get_lock_infos(["a.py", "b.py"])
+
+        assert infos["a.py"]["agent_id"] == "agent-1"
+        assert infos["b.py"] is None
+
+    async def test_reads_do_not_wait_on_writers(self, lock_manager: LockManager) -> None:
+        await lock_manager.acquire_lock("a.py", "agent-1", "Editing")
+
+        async with lock_manager._mu:
+            locks = await asyncio.wait_for(lock_manager.get_all_locks(), timeout=1.0)
+
+        assert [lock["file_path"] for lock in locks] == ["a.py"]
+
+    async def test_purge_expired_uses_expiry_column(self, lock_manager: LockManager) -> None:
+        now = datetime.now()
+        async with lock_manager._mu:
+            lock_manager._put_lock(
+                LockInfo(
+                    file_path="old.py",
+                    agent_id="agent-1",
+                    description="",
+                    locked_at=now - timedelta(hours=1),
+                    expires_at=now - timedelta(seconds=1),
+                )
+            )
+            lock_manager._put_lock(
+                LockInfo(
+                    file_path="new.py",
+                    agent_id="agent-1",
+                    description="",
+                    locked_at=now,
+                    expires_at=now + timedelta(hours=1),
+                )
+            )
+            lock_manager._purge_expired()
+
+        assert set(lock_manager._locks) == {"new.py"}
+        assert set(lock_manager._expires_at) == {"new.py"}
+        assert lock_manager._agent_by_file == {"new.py": "agent-1"}
+
+    async def test_purge_skips_stale_heap_entries(self, lock_manager: LockManager) -> None:
+        now = datetime.now()
+        lock = LockInfo(
+            file_path="a.py",
+            agent_id="agent-1",
+            description="",
+            locked_at=now,
+            expires_at=now - timedelta(seconds=1),
+        )
+        async with lock_manager._mu:
+            lock_manager._put_lock(lock)
+            lock.renew(now + timedelta(hours=1))
+            lock_manager._put_lock(lock)
+            lock_manager._purge_expired()
+
+        assert set(lock_manager._locks) == {"a.py"}
+        assert [fp for _, fp in lock_manager._expiry_heap] == ["a.py"]
+
+    async def test_cleanup_wakes_at_next_expiry(self, lock_manager: LockManager) -> None:
+        await lock_manager.acquire_lock("a.py", "agent-1", "edit", ttl_seconds=1)
+        await asyncio.sleep(1.3)
+
+        assert "a.py" not in lock_manager._locks
+        assert await lock_manager.db.get_active_locks() == []
+
+    async def test_later_expiries_do_not_wake_cleanup(self, lock_manager: LockManager) -> None:
+        await lock_manager.acquire_lock("a.py", "agent-1", "edit", ttl_seconds=60)
+        await asyncio.sleep(0.05)
+        assert not lock_manager._next_expiry_changed.is_set()
+
+        await lock_manager.acquire_lock("b.py", "agent-1", "edit", ttl_seconds=600)
+        assert not lock_manager._next_expiry_changed.is_set()
+
+    async def test_loads_reuse_unchanged_lock_objects(self, lock_manager: LockManager) -> None:
+        await lock_manager.acquire_lock("a.py", "agent-1", "edit")
+
+        first = (await lock_manager._load_locks())["a.py"]
+        assert (await lock_manager._load_locks())["a.py"] is first
+
+        await lock_manager.acquire_lock("a.py", "agent-1", "edit")
+        renewed = (await lock_manager._load_locks())["a.py"]
+        rows = await lock_manager.db.get_active_locks()
+        assert renewed.to_dict()["expires_at"] == rows[0]["expires_at"]
+
+
+class TestLockInfo:
+    def test_to_dict_is_cached_until_renew(self) -> None:
+        now = datetime.now()
+        lock = LockInfo(
+            file_path="a.py",
+            agent_id="agent-1",
+            description="",
+            locked_at=now,
+            expires_at=now + timedelta(minutes=5),
+        )
+
+        first = lock.to_dict()
+        first["agent_id"] = "mutated"
+        assert lock.to_dict()["agent_id"] == "agent-1"
+
+        later = now + timedelta(minutes=10)
+        lock.renew(later)
+        assert lock.to_dict()["expires_at"] == later.isoformat()
+
+    def test_expiry_timestamp_follows_renew(self) -> None:
+        now = datetime.now()
+        lock = LockInfo(
+            file_path="a.py",
+            agent_id="agent-1",
+            description="",
+            locked_at=now,
+            expires_at=now - timedelta(seconds=1),
+        )
+        assert lock.expires_ts == lock.expires_at.timestamp()
+        assert lock.is_expired()
+
+        lock.renew(now + timedelta(minutes=5))
+        assert lock.expires_ts == lock.expires_at.timestamp()
+        assert not lock.is_expired()
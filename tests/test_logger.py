@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterator
+
+import pytest
+
+from agentsync_mcp.utils import logger as logger_module
+from agentsync_mcp.utils.logger import setup_logging, stop_logging
+
+
+@pytest.fixture
+def root() -> Iterator[logging.Logger]:
+    root = logging.getLogger("agentsync_mcp")
+    handlers, level = list(root.handlers), root.level
+    yield root
+    stop_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def test_setup_logging_is_idempotent(root: logging.Logger) -> None:
+    before = len(root.handlers)
+
+    setup_logging("INFO")
+    setup_logging("debug")
+
+    assert len(root.handlers) == before + 1
+    assert root.level == logging.DEBUG
+
+
+def test_unknown_level_falls_back_to_info(root: logging.Logger) -> None:
+    setup_logging("verbose")
+    assert root.level == logging.INFO
+
+
+def test_records_are_written_by_the_listener(
+    root: logging.Logger, capsys: pytest.CaptureFixture[str]
+) -> None:
+    setup_logging("INFO")
+    logging.getLogger("agentsync_mcp.test").info("queued %s", "record")
+    stop_logging()
+
+    assert "[INFO] agentsync_mcp.test: queued record" in capsys.readouterr().err
+
+
+def test_burst_is_written_in_one_call(root: logging.Logger) -> None:
+    class Stream:
+        def __init__(self) -> None:
+            self.writes: list[str] = []
+
+        def write(self, text: str) -> None:
+            self.writes.append(text)
+
+        def flush(self) -> None:
+            pass
+
+    stream = Stream()
+    handler = logger_module._BatchingStreamHandler(stream)  # type: ignore[arg-type]
+    for n in range(3):
+        handler.handle(logging.makeLogRecord({"msg": f"record {n}"}))
+    assert stream.writes == []
+
+    handler.flush()
+    assert stream.writes == ["record 0\nrecord 1\nrecord 2\n"]
+
+
+def test_failed_threshold_write_goes_to_handle_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    class BrokenStream:
+        def write(self, text: str) -> None:
+            raise OSError("stderr closed")
+
+        def flush(self) -> None:
+            pass
+
+    monkeypatch.setattr(logger_module, "_MAX_BATCH_RECORDS", 1)
+    handler = logger_module._BatchingStreamHandler(BrokenStream())  # type: ignore[arg-type]
+    failed: list[logging.LogRecord] = []
+    monkeypatch.setattr(handler, "handleError", failed.append)
+
+    record = logging.makeLogRecord({"msg": "lost"})
+    handler.handle(record)
+
+    assert failed == [record]
+    assert handler._pending == []
@@ -17,6 +17,7 @@ class TestWorkQueue:
 
         active = await work_queue.get_active_work()
         assert len(active) == 1
+        assert active[0]["work_id"] == work_id
         assert active[0]["agent_id"] == "agent-1"
         assert active[0]["files"] == ["src/auth.py", "src/login.py"]
 
@@ -53,8 +54,12 @@ class TestWorkQueue:
 
     async def test_get_recent_actions(self, work_queue: WorkQueue, db: Database) -> None:
         await db.register_agent("agent-1")
-        await work_queue.register_action("agent-1", "modify", ["a.py"], "Change A")
-        await work_queue.register_action("agent-1", "create", ["b.py"], "Create B")
+        await db.register_actions_bulk(
+            [
+                ("agent-1", "modify", ["a.py"], "Change A"),
+                ("agent-1", "create", ["b.py"], "Create B"),
+            ]
+        )
 
         all_actions = await work_queue.get_recent_actions()
         assert len(all_actions) == 2
@@ -69,3 +74,17 @@ class TestWorkQueue:
 
         agents = await work_queue.get_all_agents()
         assert set(agents) == {"agent-1", "agent-2"}
+
+    async def test_work_events_are_logged(self, work_queue: WorkQueue, db: Database) -> None:
+        await db.register_agent("agent-1")
+        work_id = await work_queue.create_work_item("agent-1", "Task A", ["a.py"])
+        assert await work_queue.complete_work("agent-1", commit_hash="abc123") is True
+        assert await work_queue.complete_work("agent-1") is False
+
+        cursor = await db.conn.execute(
+            "SELECT event_type, details FROM event_log WHERE agent_id = 'agent-1' ORDER BY id"
+        )
+        assert [tuple(row) for row in await cursor.fetchall()] == [
+            ("work_started", f'{{"work_id":{work_id},"description":"Task A","files":["a.py"]}}'),
+            ("work_completed", '{"commit_hash":"abc123"}'),
+        ]